@@ -1,278 +1,99 @@
+import uuid
+from functools import partial
+
 import streamlit as st
-import pandas as pd
-from collections import defaultdict
-
-# ---- FULL STROBE ITEMS ----
-STROBE_ITEMS = [
-    {
-        "section": "Title and Abstract",
-        "item": "Indicate the study’s design with a commonly used term in the title or the abstract.",
-        "guidance": "Clearly state the study design (e.g., cohort, case-control, cross-sectional) in the title or abstract.",
-        "link": "https://www.strobe-statement.org/checklists/",
-        "tag_options": [
-            "No mention of study design in the title or abstract.",
-            "Study design is referenced but not clearly or consistently.",
-            "Study design is clearly and appropriately stated."
-        ]
-    },
-    {
-        "section": "Title and Abstract",
-        "item": "Provide in the abstract an informative and balanced summary of what was done and what was found.",
-        "guidance": "Summarize study purpose, methods, key results, and conclusions in the abstract.",
-        "link": "https://www.strobe-statement.org/checklists/",
-        "tag_options": [
-            "The abstract is missing key information about methods or results.",
-            "The abstract provides some summary but is incomplete or unbalanced.",
-            "The abstract gives a clear, informative, and balanced summary."
-        ]
-    },
-    {
-        "section": "Introduction",
-        "item": "Explain the scientific background and rationale for the investigation being reported.",
-        "guidance": "Describe why the study was done, with context and relevant literature.",
-        "link": "https://www.strobe-statement.org/checklists/",
-        "tag_options": [
-            "Scientific background and rationale are missing.",
-            "Some background is given but lacks context or sufficient detail.",
-            "Rationale is well described and contextualized with relevant literature."
-        ]
-    },
-    {
-        "section": "Introduction",
-        "item": "State specific objectives, including any prespecified hypotheses.",
-        "guidance": "Clearly state what you set out to do, including hypotheses.",
-        "link": "https://www.strobe-statement.org/checklists/",
-        "tag_options": [
-            "Objectives or hypotheses are not stated.",
-            "Objectives are stated but are vague or hypotheses are missing.",
-            "Objectives and hypotheses are clearly stated and specific."
-        ]
-    },
-    {
-        "section": "Methods",
-        "item": "Present key elements of study design early in the paper.",
-        "guidance": "Identify the type of study and its key design features.",
-        "link": "https://www.strobe-statement.org/checklists/",
-        "tag_options": [
-            "Key elements of the study design are not presented.",
-            "Some study design elements are given but not early or not all are present.",
-            "Study design and its key features are introduced clearly at the start."
-        ]
-    },
-    {
-        "section": "Methods",
-        "item": "Describe the setting, locations, and relevant dates, including periods of recruitment, exposure, follow-up, and data collection.",
-        "guidance": "State where and when the study was done.",
-        "link": "https://www.strobe-statement.org/checklists/",
-        "tag_options": [
-            "Setting, locations, or study dates are missing.",
-            "Setting or dates are partially reported.",
-            "All relevant settings, locations, and dates are well described."
-        ]
-    },
-    {
-        "section": "Methods",
-        "item": "Give the eligibility criteria, and the sources and methods of selection of participants. Describe methods of follow-up. For matched studies, give matching criteria and number of exposed/unexposed.",
-        "guidance": "Explain how participants were identified, included, excluded, and how they were followed up.",
-        "link": "https://www.strobe-statement.org/checklists/",
-        "tag_options": [
-            "Eligibility criteria or selection methods are not described.",
-            "Some eligibility or selection details are given but are incomplete.",
-            "Eligibility criteria and participant selection are fully explained."
-        ]
-    },
-    {
-        "section": "Methods",
-        "item": "For each variable of interest, give sources of data and details of methods of assessment (measurement).",
-        "guidance": "Describe how each variable was measured or obtained.",
-        "link": "https://www.strobe-statement.org/checklists/",
-        "tag_options": [
-            "Variables or their measurement are not described.",
-            "Some variables or measurement methods are described.",
-            "All variables and measurement methods are described in detail."
-        ]
-    },
-    {
-        "section": "Methods",
-        "item": "Describe any efforts to address potential sources of bias.",
-        "guidance": "Discuss what you did to minimize bias (e.g., blinding, statistical adjustments).",
-        "link": "https://www.strobe-statement.org/checklists/",
-        "tag_options": [
-            "No mention of efforts to address bias.",
-            "Some efforts to reduce bias are described but lack detail.",
-            "Potential sources of bias and mitigation efforts are thoroughly discussed."
-        ]
-    },
-    {
-        "section": "Methods",
-        "item": "Explain how the study size was arrived at.",
-        "guidance": "Provide rationale for sample size, power calculations if possible.",
-        "link": "https://www.strobe-statement.org/checklists/",
-        "tag_options": [
-            "No explanation for how the sample size was determined.",
-            "Sample size is mentioned, but rationale or calculations are lacking.",
-            "Sample size rationale and calculations are clearly explained."
-        ]
-    },
-    {
-        "section": "Methods",
-        "item": "Explain how quantitative variables were handled in the analyses. If applicable, describe which groupings were chosen and why.",
-        "guidance": "Describe handling of quantitative data (e.g., categorized, continuous).",
-        "link": "https://www.strobe-statement.org/checklists/",
-        "tag_options": [
-            "Handling of quantitative variables is not described.",
-            "Some information on quantitative variables is given but not complete.",
-            "Quantitative variable handling and groupings are well described."
-        ]
-    },
-    {
-        "section": "Methods",
-        "item": "Describe all statistical methods, including those used to control for confounding.",
-        "guidance": "Outline your statistical approach, including confounder adjustment, missing data handling, etc.",
-        "link": "https://www.strobe-statement.org/checklists/",
-        "tag_options": [
-            "Statistical methods are not described.",
-            "Some statistical methods are given but confounders or missing data not addressed.",
-            "All statistical methods, confounding, and missing data approaches are detailed."
-        ]
-    },
-    {
-        "section": "Results",
-        "item": "Report numbers of individuals at each stage of study (e.g., eligible, included, follow-up, analyzed). Give reasons for non-participation at each stage. Consider use of a flow diagram.",
-        "guidance": "Show a flow of participant numbers, with reasons for exclusions.",
-        "link": "https://www.strobe-statement.org/checklists/",
-        "tag_options": [
-            "Numbers at each stage are not reported.",
-            "Some numbers or reasons for non-participation are given, but incomplete.",
-            "All numbers and reasons for non-participation are reported, with a flow diagram if applicable."
-        ]
-    },
-    {
-        "section": "Results",
-        "item": "Give characteristics of study participants (e.g., demographic, clinical, social) and information on exposures and potential confounders. Indicate number of participants with missing data for each variable. Summarize follow-up time.",
-        "guidance": "Provide descriptive stats for the sample, and report missing data.",
-        "link": "https://www.strobe-statement.org/checklists/",
-        "tag_options": [
-            "Participant characteristics and missing data are not reported.",
-            "Some characteristics or missing data are reported, but not all.",
-            "All participant characteristics, confounders, and missing data are fully reported."
-        ]
-    },
-    {
-        "section": "Results",
-        "item": "Report numbers of outcome events or summary measures over time.",
-        "guidance": "Present main outcome data (events, summary measures).",
-        "link": "https://www.strobe-statement.org/checklists/",
-        "tag_options": [
-            "Outcome events or summary measures are not reported.",
-            "Some outcome events are reported, but data is incomplete.",
-            "Outcome events and summary measures are fully and clearly reported."
-        ]
-    },
-    {
-        "section": "Results",
-        "item": "Give unadjusted estimates and, if applicable, confounder-adjusted estimates and their precision (e.g., 95% confidence interval). Report category boundaries when continuous variables were categorized. If relevant, consider translating estimates of relative risk into absolute risk.",
-        "guidance": "Show both crude and adjusted results with precision (CIs), and define any group boundaries.",
-        "link": "https://www.strobe-statement.org/checklists/",
-        "tag_options": [
-            "Estimates and precision are not reported.",
-            "Estimates are given, but adjusted results or CIs are missing or incomplete.",
-            "Both unadjusted and adjusted estimates, precision, and category boundaries are fully reported."
-        ]
-    },
-    {
-        "section": "Results",
-        "item": "Report other analyses done (e.g., subgroup analyses and sensitivity analyses).",
-        "guidance": "Describe any secondary, subgroup, or sensitivity analyses.",
-        "link": "https://www.strobe-statement.org/checklists/",
-        "tag_options": [
-            "No additional analyses are reported.",
-            "Some secondary analyses are described, but not all relevant analyses.",
-            "All secondary, subgroup, and sensitivity analyses are clearly reported."
-        ]
-    },
-    {
-        "section": "Discussion",
-        "item": "Summarize key results with reference to study objectives.",
-        "guidance": "Recap the main findings in light of the objectives.",
-        "link": "https://www.strobe-statement.org/checklists/",
-        "tag_options": [
-            "Key results are not summarized.",
-            "Results are summarized but not linked to study objectives.",
-            "Key results are well summarized with clear reference to objectives."
-        ]
-    },
-    {
-        "section": "Discussion",
-        "item": "Discuss limitations of the study, taking into account sources of potential bias or imprecision. Discuss both direction and magnitude of any potential bias.",
-        "guidance": "Acknowledge weaknesses and possible biases; discuss direction and size.",
-        "link": "https://www.strobe-statement.org/checklists/",
-        "tag_options": [
-            "Study limitations are not discussed.",
-            "Some limitations are discussed, but bias or imprecision are not fully considered.",
-            "Limitations, potential bias, and their direction and magnitude are thoroughly discussed."
-        ]
-    },
-    {
-        "section": "Discussion",
-        "item": "Give a cautious overall interpretation of results considering objectives, limitations, multiplicity of analyses, results from similar studies, and other relevant evidence.",
-        "guidance": "Discuss meaning and context, but avoid overstating conclusions.",
-        "link": "https://www.strobe-statement.org/checklists/",
-        "tag_options": [
-            "Overall interpretation is missing or overstates conclusions.",
-            "Interpretation is present but does not fully consider limitations or other evidence.",
-            "Interpretation is cautious and well-contextualized with study limitations and existing literature."
-        ]
-    },
-    {
-        "section": "Discussion",
-        "item": "Discuss the generalizability (external validity) of the study results.",
-        "guidance": "Comment on how well results may apply elsewhere.",
-        "link": "https://www.strobe-statement.org/checklists/",
-        "tag_options": [
-            "No discussion of generalizability or external validity.",
-            "Generalizability is mentioned but not fully discussed.",
-            "Generalizability and external validity are clearly discussed."
-        ]
-    },
-    {
-        "section": "Other Information",
-        "item": "Give the source of funding and the role of the funders for the present study and, if applicable, for the original study on which the present article is based.",
-        "guidance": "State how the study was funded and any role of the sponsor.",
-        "link": "https://www.strobe-statement.org/checklists/",
-        "tag_options": [
-            "Funding information is not provided.",
-            "Funding is stated, but the role of funders is not described.",
-            "Funding sources and funders' roles are fully described."
-        ]
-    }
-]
-
-score_labels = {1: "1 = Not addressed", 2: "2 = Partially", 3: "3 = Fully addressed"}
-score_colors = {1: "#e74c3c", 2: "#f1c40f", 3: "#2ecc40"}  # Red, Yellow, Green
-
-# --- Sections in first-appearance order ---
-sections = []
-for item in STROBE_ITEMS:
-    if item["section"] not in sections:
-        sections.append(item["section"])
+
+from strobe.core import build_rows, summarize
+from strobe.export import EXPORT_FORMATS, export_assessment
+from strobe.importer import read_export
+from strobe.profiler import SPAN_HISTORY, SpanRecorder, metrics_port_from_env, profiling_default, start_metrics_server, trace_from_env
+from strobe.registry import ChecklistError, get_checklist, registry
+from strobe.state import AssessmentState
+from strobe.store import AssessmentStore, AutosaveWriter
+
+PAGE_SIZE = 10  # items rendered per page within a long section
+
+# --- Persistence (one store and autosave thread per process) ---
+@st.cache_resource
+def get_autosave():
+    return AutosaveWriter(AssessmentStore())
+
+
+@st.cache_resource
+def get_trace():
+    return trace_from_env()
+
+
+@st.cache_resource
+def get_metrics_server():
+    port = metrics_port_from_env()
+    return start_metrics_server(port) if port else None
+
+
+autosave = get_autosave()
+get_metrics_server()
+
+# --- Profiling (spans are no-ops unless turned on in the sidebar) ---
+if "profiler" not in st.session_state:
+    st.session_state.profiler = SpanRecorder(trace=get_trace(), labels={"session": uuid.uuid4().hex})
+profiler = st.session_state.profiler
+profiler.enabled = st.session_state.get("profile_reruns", profiling_default())
+page_span = profiler.start("rerun")
+
+# The assessment ID lives in the URL so a refresh or a new replica resumes it.
+assessment_id = st.query_params.get("assessment")
+if not assessment_id:
+    assessment_id = uuid.uuid4().hex
+    st.query_params["assessment"] = assessment_id
+
+
+def _new_assessment(checklist_id=None):
+    """Point the URL at a fresh assessment, optionally on another checklist."""
+    if checklist_id:
+        st.query_params["checklist"] = checklist_id
+    st.query_params["assessment"] = uuid.uuid4().hex
+
+
+def _open_assessment(assessment_id):
+    """Restore an assessment from the store, or start one on the requested checklist."""
+    # A refresh right after an edit can arrive before the writer's next flush.
+    autosave.flush()
+    stored = autosave.store.checklist_of(assessment_id)
+    checklist_id = stored[0] if stored else st.query_params.get("checklist")
+    try:
+        checklist = get_checklist(checklist_id)
+    except ChecklistError:
+        st.warning(f"Unknown checklist {checklist_id!r}; using the default checklist instead.")
+        checklist = get_checklist()
+    state = AssessmentState(checklist)
+    if stored:
+        if stored[1] != checklist.version:
+            st.warning(
+                f"This assessment was started on {checklist.title} v{stored[1]}; "
+                f"it is now shown against v{checklist.version}."
+            )
+        state.restore(autosave.store.load_items(assessment_id))
+    # Widget values from a previous assessment must not leak into this one.
+    for key in [k for k in st.session_state if str(k).startswith(("score_", "tag_", "comment_", "expand_", "page_"))]:
+        del st.session_state[key]
+    st.session_state.checklist_choice = checklist.id
+    return state
+
 
 # --- Session State ---
-n_items = len(STROBE_ITEMS)
-if "scores" not in st.session_state or len(st.session_state.scores) != n_items:
-    st.session_state.scores = [2] * n_items
-if "comments" not in st.session_state or len(st.session_state.comments) != n_items:
-    st.session_state.comments = [""] * n_items
-if "selected_tags" not in st.session_state or len(st.session_state.selected_tags) != n_items:
-    st.session_state.selected_tags = [[] for _ in range(n_items)]
-if "manual_comment_edit" not in st.session_state or len(st.session_state.manual_comment_edit) != n_items:
-    st.session_state.manual_comment_edit = [False] * n_items
-
-if "expand_states" not in st.session_state or len(st.session_state.expand_states) != len(sections):
-    st.session_state.expand_states = [False] * len(sections)
+with profiler.span("session_init"):
+    if st.session_state.get("assessment_id") != assessment_id:
+        st.session_state.assessment = _open_assessment(assessment_id)
+        st.session_state.assessment_id = assessment_id
+state = st.session_state.assessment
+
+# --- Checklist model (loaded once per process, shared by all sessions) ---
+checklist = state.checklist
+sections = checklist.sections
 
 st.set_page_config(page_title="STROBE Self-Assessment", layout="wide")
 st.title("📝 STROBE Self-Assessment Tool for TriNetX Projects")
+st.caption(f"Checklist: {checklist.title} (v{checklist.version})")
 
 # --- Toolbar ---
 col1, col2 = st.columns([1,2])
@@ -282,108 +103,253 @@ with col2:
     toc_mode = st.checkbox("📑 Show Table of Contents", value=True)
 
 # Expand/Collapse all buttons
+def _expand_all(expanded):
+    for sec in sections:
+        st.session_state[f"expand_{sec.index}"] = expanded
+
+
 colA, colB = st.columns(2)
 with colA:
-    if st.button("Expand All Sections"):
-        st.session_state.expand_states = [True] * len(sections)
+    st.button("Expand All Sections", on_click=_expand_all, args=(True,))
 with colB:
-    if st.button("Collapse All Sections"):
-        st.session_state.expand_states = [False] * len(sections)
+    st.button("Collapse All Sections", on_click=_expand_all, args=(False,))
 
 # --- Sidebar: TOC ---
 if toc_mode:
-    st.sidebar.markdown("## 📑 Jump to Section")
-    for sec in sections:
-        st.sidebar.markdown(f"- [{sec}](#{sec.replace(' ', '-')})", unsafe_allow_html=True)
-
-# --- Group items by section ---
-section_items = defaultdict(list)
-for i, item in enumerate(STROBE_ITEMS):
-    section_items[item["section"]].append((i, item))
-
-with st.form("strobe_form"):
-    st.markdown("### Self-Assessment Checklist")
-    for sec_idx, (section, items) in enumerate(section_items.items()):
-        st.markdown(f'<a name="{section.replace(" ", "-")}"></a>', unsafe_allow_html=True)
-        expanded = st.session_state.expand_states[sec_idx]
-        with st.expander(section, expanded=expanded):
-            any_rendered = False
-            for idx, item in items:
-                if show_incomplete_only and st.session_state.scores[idx] == 3:
-                    continue
-                any_rendered = True
-                c1, c2, c3 = st.columns([3, 1, 2])
-                with c1:
-                    st.markdown(
-                        f"<span style='font-weight:bold;'>{item['item']}</span>"
-                        f"<br><span style='font-size:0.85em; color: #555;'>{item['guidance']}</span>",
-                        unsafe_allow_html=True
-                    )
-                    st.markdown(f"<a href='{item['link']}' style='font-size:0.85em;' target='_blank'>[STROBE Guidance]</a>", unsafe_allow_html=True)
-                with c2:
-                    color = score_colors[st.session_state.scores[idx]]
-                    st.markdown(
-                        f"<span style='font-size:1.5em; color:{color};'>●</span>",
-                        unsafe_allow_html=True,
-                    )
-                    score = st.selectbox(
-                        "",
-                        [1, 2, 3],
-                        index=st.session_state.scores[idx] - 1,
-                        format_func=lambda x: score_labels[x],
-                        key=f"score_{idx}"
-                    )
-                    st.session_state.scores[idx] = score
-                with c3:
-                    st.markdown("**Select feedback tags:**")
-                    tags = []
-                    for tag_idx, tag in enumerate(item["tag_options"]):
-                        checked = tag in st.session_state.selected_tags[idx]
-                        new_checked = st.checkbox(tag, value=checked, key=f"tag_{idx}_{tag_idx}")
-                        if new_checked:
-                            tags.append(tag)
-                    if not st.session_state.manual_comment_edit[idx]:
-                        comment_val = "; ".join(tags)
-                        st.session_state.comments[idx] = comment_val
-                    st.session_state.selected_tags[idx] = tags
-                    comment_input = st.text_area(
-                        "Comments / Feedback",
-                        value=st.session_state.comments[idx],
-                        key=f"comment_{idx}"
-                    )
-                    if comment_input != "; ".join(st.session_state.selected_tags[idx]):
-                        st.session_state.manual_comment_edit[idx] = True
-                    else:
-                        st.session_state.manual_comment_edit[idx] = False
-                    st.session_state.comments[idx] = comment_input
-                st.markdown("---")
-            if not any_rendered:
-                st.info("All items in this section are fully addressed (score = 3).")
-
-    submitted = st.form_submit_button("Submit Self-Assessment")
+    with profiler.span("toc"):
+        st.sidebar.markdown("## 📑 Jump to Section")
+        for sec in sections:
+            st.sidebar.markdown(sec.toc_markdown, unsafe_allow_html=True)
+
+# --- Sidebar: autosave ---
+st.sidebar.markdown("## 💾 Autosave")
+st.sidebar.caption(f"Assessment `{assessment_id}` is saved as you go. Bookmark this page to resume it later.")
+st.sidebar.selectbox(
+    "Checklist",
+    [info.id for info in registry.available()],
+    format_func=lambda checklist_id: registry.info(checklist_id).title,
+    key="checklist_choice",
+    on_change=lambda: _new_assessment(st.session_state.checklist_choice),
+    help="Switching checklists starts a new assessment; the current one stays saved.",
+)
+st.sidebar.button("Start a new assessment", on_click=_new_assessment)
+
+
+# --- Sidebar: resume from an export ---
+def _restore_export():
+    upload = st.session_state.export_upload
+    upload.seek(0)
+    try:
+        imported = read_export(upload, upload.name, checklist)
+    except ValueError as exc:
+        st.session_state.import_result = ("error", str(exc))
+        return
+    state.restore(imported.item_row(idx) for idx in range(len(imported)))
+    state.mark_all_dirty()
+    st.session_state.import_result = ("success", f"Restored {len(imported)} items from {upload.name}.")
+
+
+st.sidebar.markdown("## 📤 Resume from an export")
+st.sidebar.file_uploader(
+    "Exported assessment", type=["csv", "json"], key="export_upload",
+    help="A CSV or JSON file downloaded from this tool. It replaces the current scores, tags and comments.",
+)
+st.sidebar.button("Restore from file", on_click=_restore_export, disabled=st.session_state.export_upload is None)
+if "import_result" in st.session_state:
+    kind, message = st.session_state.pop("import_result")
+    getattr(st.sidebar, kind)(message)
+
+
+# --- Sidebar: manuscript pre-scoring ---
+def _prescore_manuscript():
+    from strobe.prescore import ExtractUnavailable, extract_text, prescore_text
+
+    upload = st.session_state.manuscript_upload
+    upload.seek(0)
+    try:
+        text = extract_text(upload, upload.name)
+    except (ExtractUnavailable, ValueError) as exc:
+        st.session_state.prescore_result = ("error", str(exc))
+        return
+    suggestions = prescore_text(text, checklist)
+    for suggestion in suggestions:
+        state.set_score(suggestion.index, suggestion.score)
+        state.set_tags(suggestion.index, suggestion.tags)
+    n_found = sum(1 for s in suggestions if s.hits)
+    st.session_state.prescore_result = (
+        "success",
+        f"Pre-filled {len(suggestions)} items from {upload.name}; found reporting cues for {n_found}. Review every suggestion.",
+    )
+
+
+st.sidebar.markdown("## 🔎 Pre-score from manuscript")
+st.sidebar.file_uploader(
+    "Manuscript", type=["txt", "md", "docx", "pdf"], key="manuscript_upload",
+    help="Scores and tags are suggested from the text and replace the current ones.",
+)
+st.sidebar.button(
+    "Suggest scores and tags", on_click=_prescore_manuscript, disabled=st.session_state.manuscript_upload is None
+)
+if "prescore_result" in st.session_state:
+    kind, message = st.session_state.pop("prescore_result")
+    getattr(st.sidebar, kind)(message)
+
+# --- Sidebar: rerun latency ---
+st.sidebar.markdown("## ⏱ Performance")
+isolated_reruns = st.sidebar.toggle(
+    "Isolated section reruns",
+    value=True,
+    help="Rerun only the section you changed. Turn off to compare against full-page reruns.",
+)
+st.sidebar.checkbox(
+    "Profile reruns",
+    value=profiling_default(),
+    key="profile_reruns",
+    help="Time session setup, the table of contents, each section and submit exports.",
+)
+
+
+# --- Widget <-> state reconciliation ---
+# Widgets are keyed per item; callbacks write straight into the
+# AssessmentState, and only dirty items have their widget values re-synced.
+def _on_score(idx):
+    state.set_score(idx, st.session_state[f"score_{idx}"])
+
+
+def _on_tag(idx, bit):
+    state.set_tag(idx, bit, st.session_state[f"tag_{idx}_{bit}"])
+
+
+def _on_comment(idx):
+    state.set_comment(idx, st.session_state[f"comment_{idx}"])
+
+
+def _sync_widgets(indices):
+    for idx in indices:
+        st.session_state[f"score_{idx}"] = state.scores[idx]
+        for bit in range(len(checklist.items[idx].tag_options)):
+            st.session_state[f"tag_{idx}_{bit}"] = state.has_tag(idx, bit)
+        st.session_state[f"comment_{idx}"] = state.comments[idx]
+
+
+def _reconcile(indices):
+    """Push dirty items to their widgets and queue them for autosave."""
+    dirty = state.pop_dirty(within=indices)
+    if dirty:
+        _sync_widgets(dirty)
+        autosave.submit(assessment_id, checklist, [state.item_row(idx) for idx in dirty])
+
+
+def _seed_widgets(idx):
+    # Widget values are dropped by Streamlit while a widget is not rendered.
+    if f"score_{idx}" not in st.session_state:
+        _sync_widgets((idx,))
+
+
+def _turn_page(page_key, step):
+    st.session_state[page_key] += step
+
+
+def _paginate(section, visible):
+    """Slice ``visible`` to the section's current page, with pager controls."""
+    n_pages = -(-len(visible) // PAGE_SIZE)
+    if n_pages <= 1:
+        return visible
+    page_key = f"page_{section.index}"
+    page = min(st.session_state.get(page_key, 0), n_pages - 1)
+    st.session_state[page_key] = page
+    first = page * PAGE_SIZE
+    prev_col, info_col, next_col = st.columns([1, 4, 1])
+    with prev_col:
+        st.button("◀ Previous", key=f"prev_{section.index}", disabled=page == 0, on_click=_turn_page, args=(page_key, -1))
+    with info_col:
+        st.caption(f"Items {first + 1}–{min(first + PAGE_SIZE, len(visible))} of {len(visible)} (page {page + 1} of {n_pages})")
+    with next_col:
+        st.button("Next ▶", key=f"next_{section.index}", disabled=page == n_pages - 1, on_click=_turn_page, args=(page_key, 1))
+    return visible[first:first + PAGE_SIZE]
+
+
+def _render_item(idx):
+    item = checklist.items[idx]
+    _seed_widgets(idx)
+    c1, c2, c3 = st.columns([3, 1, 2])
+    with c1:
+        st.markdown(item.body_html, unsafe_allow_html=True)
+        st.markdown(item.link_html, unsafe_allow_html=True)
+    with c2:
+        st.markdown(checklist.score_dot_html[state.scores[idx]], unsafe_allow_html=True)
+        st.selectbox(
+            "Score",
+            checklist.score_options,
+            format_func=checklist.format_score,
+            key=f"score_{idx}",
+            on_change=_on_score,
+            args=(idx,),
+            label_visibility="collapsed",
+        )
+    with c3:
+        st.markdown("**Select feedback tags:**")
+        for bit, tag in enumerate(item.tag_options):
+            st.checkbox(tag, key=f"tag_{idx}_{bit}", on_change=_on_tag, args=(idx, bit))
+        st.text_area("Comments / Feedback", key=f"comment_{idx}", on_change=_on_comment, args=(idx,))
+    st.markdown("---")
+
+
+def render_section(section, show_incomplete_only):
+    with profiler.span("render_section", section.name):
+        with profiler.span("reconcile", section.name):
+            _reconcile(section.item_indices)
+        with st.container(border=True):
+            # Unlike st.expander, a collapsed section creates none of its item widgets.
+            expanded = st.toggle(f"**{section.name}**", key=f"expand_{section.index}")
+            st.caption(f"{state.n_complete(section)} of {len(section.item_indices)} items fully addressed")
+            if expanded:
+                visible = state.visible_items(section, show_incomplete_only)
+                if not visible:
+                    st.info("All items in this section are fully addressed (score = 3).")
+                for idx in _paginate(section, visible):
+                    _render_item(idx)
+    if profiler.enabled:
+        st.caption(f"⏱ Last rerun of this section: {profiler.last_ms['render_section', section.name]:.1f} ms")
+
+
+# Each section is its own fragment, so a widget change only reruns that section.
+render_section_fragment = st.fragment(render_section)
+render = render_section_fragment if isolated_reruns else render_section
+
+st.markdown("### Self-Assessment Checklist")
+for section in sections:
+    st.markdown(section.anchor_html, unsafe_allow_html=True)
+    render(section, show_incomplete_only)
+
+submitted = st.button("Submit Self-Assessment")
+
+def _profiled_export(profiler, fmt_name, checklist, scores, comments):
+    # Runs when the download is clicked, outside any page span.
+    with profiler.span("export", fmt_name):
+        return export_assessment(fmt_name, checklist, scores, comments)
+
 
 if submitted:
-    df = pd.DataFrame([
-        {
-            "Section": item["section"],
-            "Checklist Item": item["item"],
-            "Score": st.session_state.scores[idx],
-            "Comments": st.session_state.comments[idx],
-            "Guidance Link": item["link"]
-        }
-        for idx, item in enumerate(STROBE_ITEMS)
-    ])
+    # pandas is only needed from here on; importing it up front would add
+    # about as much to a cold start as Streamlit itself.
+    import pandas as pd
+
+    with profiler.span("record_submission"):
+        autosave.store.record_submission(assessment_id, checklist, state.scores, state.tag_masks)
+    with profiler.span("submit_summary"):
+        rows = build_rows(state.scores, state.comments, checklist)
+        summary = summarize(state.scores, state.comments, checklist)
+        df = pd.DataFrame(rows)
     st.success("Assessment Complete!")
     st.dataframe(df, use_container_width=True)
 
-    percent_fully = round(100 * (df['Score'] == 3).sum() / len(df), 1)
-    st.write(f"**Percent fully addressed:** {percent_fully}%")
-    st.write(f"**Average score:** {round(df['Score'].mean(), 2)} / 3")
+    st.write(f"**Percent fully addressed:** {summary.percent_fully}%")
+    st.write(f"**Average score:** {summary.average_score} / 3")
 
-    low_scores = df[df["Score"] < 3]
-    if not low_scores.empty:
+    if summary.improvements:
         st.warning("### Areas for Improvement")
-        for i, row in low_scores.iterrows():
+        for row in summary.improvements:
             st.markdown(
                 f"- **{row['Section']}**: [{row['Checklist Item']}]({row['Guidance Link']})  \n"
                 f"  - Your score: {row['Score']}\n"
@@ -392,10 +358,24 @@ if submitted:
     else:
         st.success("All items fully addressed! ✅")
 
-    csv = df.to_csv(index=False).encode()
-    st.download_button(
-        label="📥 Download as CSV",
-        data=csv,
-        file_name="strobe_self_assessment.csv",
-        mime="text/csv",
-    )
+    # Exports are rendered only when a button is clicked, from a snapshot of
+    # this submission, and cached by content hash across sessions.
+    snapshot = (state.scores[:], list(state.comments))
+    st.markdown("**📥 Download**")
+    for col, fmt in zip(st.columns(len(EXPORT_FORMATS)), EXPORT_FORMATS.values()):
+        with col:
+            available = fmt.is_available()
+            st.download_button(
+                label=fmt.label,
+                data=partial(_profiled_export, profiler, fmt.name, checklist, *snapshot),
+                file_name=f"strobe_self_assessment.{fmt.extension}",
+                mime=fmt.mime,
+                on_click="ignore",
+                disabled=not available,
+                help=None if available else f"Install {fmt.requires} to enable {fmt.label} export.",
+            )
+
+page_span.stop()
+if profiler.enabled:
+    st.sidebar.markdown("**Profiler: last %d runs per stage**" % SPAN_HISTORY)
+    st.sidebar.dataframe(profiler.summary(), hide_index=True)
@@ -0,0 +1,96 @@
+"""Timing benchmark for the portfolio analytics at cohort scale.
+
+Fills a throwaway database with N synthetic submitted assessments spread
+over a year, then times reading the running aggregates, loading the score
+matrix, computing each dashboard view and recording one more submission.
+Prints a JSON report in milliseconds.
+
+    python benchmarks/analytics_bench.py --assessments 50000
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from contextlib import closing
+from pathlib import Path
+
+import numpy as np
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from strobe import analytics  # noqa: E402
+from strobe.aggregates import section_layout  # noqa: E402
+from strobe.registry import get_checklist  # noqa: E402
+from strobe.store import AssessmentStore  # noqa: E402
+
+YEAR_SECONDS = 365 * 24 * 3600
+
+
+def populate(store, checklist, n_assessments, seed):
+    rng = np.random.default_rng(seed)
+    scores = rng.choice([1, 2, 3], size=(n_assessments, len(checklist)), p=[0.15, 0.35, 0.5]).astype(np.int8)
+    submitted = time.time() - rng.uniform(0, YEAR_SECONDS, n_assessments)
+    masks = rng.integers(0, 1 << 3, size=scores.shape, dtype=np.uint32)
+    rows = [
+        (f"bench-{i:07d}", checklist.id, checklist.version, t, t, t, scores[i].tobytes(), masks[i].tobytes())
+        for i, t in enumerate(submitted)
+    ]
+    with closing(store.connect()) as conn, conn:
+        conn.executemany(
+            "INSERT INTO assessments (assessment_id, checklist_id, checklist_version, created_at, updated_at,"
+            " submitted_at, submitted_scores, submitted_tags) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+    store.repair_aggregates({(checklist.id, checklist.version): section_layout(checklist)})
+
+
+def timed(fn, *args, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn(*args)
+        best = min(best, (time.perf_counter() - started) * 1000)
+    return result, round(best, 2)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--assessments", type=int, default=50_000, help="Synthetic submitted assessments.")
+    parser.add_argument("-c", "--checklist", default=None, help="Checklist ID (default: strobe).")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    checklist = get_checklist(args.checklist)
+    store = AssessmentStore(os.path.join(tempfile.mkdtemp(prefix="strobe-analytics-"), "bench.db"))
+    populate(store, checklist, args.assessments, args.seed)
+
+    totals, aggregates_ms = timed(store.load_aggregates, checklist)
+    matrix, matrix_ms = timed(analytics.load_score_matrix, store, checklist)
+    _, counts_ms = timed(analytics.score_counts, matrix)
+    report = {
+        "assessments": len(matrix),
+        "items": len(checklist),
+        "load_aggregates": aggregates_ms,
+        "load_score_matrix": matrix_ms,
+        "score_counts": counts_ms,
+    }
+    for name, fn, fn_args in (
+        ("item_distribution", analytics.item_distribution, (totals.item_counts, checklist)),
+        ("section_distribution", analytics.section_distribution, (totals.item_counts, checklist)),
+        ("top_shortfalls", analytics.top_shortfalls, (totals.item_counts, checklist)),
+        ("top_tags", analytics.top_tags, (totals.tag_counts, checklist)),
+        ("submission_trend", analytics.submission_trend, (matrix,)),
+    ):
+        _, report[name] = timed(fn, *fn_args)
+    resubmit = (matrix.assessment_ids[0], checklist, matrix.scores[0][::-1].tobytes(), [0] * len(checklist))
+    _, report["record_submission"] = timed(store.record_submission, *resubmit)
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
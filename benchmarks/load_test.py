@@ -0,0 +1,236 @@
+"""Concurrent-session load test for the Streamlit app.
+
+Simulates N reviewers, each driving their own headless ``AppTest`` session:
+changing scores, ticking tags, typing comments, toggling "Show only
+incomplete items" and submitting, all against one shared autosave
+database. Reports rerun latency percentiles, time to the first rendered
+checklist and memory per session as JSON. Sections start collapsed, so
+the first paint (``first_paint_ms``) shows no items. ``first_render_ms``
+times the "Expand All" rerun that renders every item widget, which keeps
+it comparable with reports from before sections started collapsed.
+
+``AppTest`` owns a process-global Streamlit runtime, so concurrent
+reviewers run in separate worker processes.
+
+    python benchmarks/load_test.py --sessions 20 --actions 30 -o load.json
+    python benchmarks/load_test.py --baseline load.json   # exit 1 on regression
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+APP_PATH = REPO_ROOT / "TriNetXStrobeChecklist.py"
+sys.path.insert(0, str(REPO_ROOT))
+
+ACTIONS = ("score", "tag", "comment", "filter", "submit")
+ACTION_WEIGHTS = (5, 5, 3, 1, 1)
+FILTER_LABEL = "Show only incomplete items"
+SUBMIT_LABEL = "Submit Self-Assessment"
+EXPAND_LABEL = "Expand All Sections"
+
+
+def percentiles(samples):
+    """Nearest-rank p50/p95/p99 plus mean and max, in milliseconds."""
+    if not samples:
+        return {}
+    ordered = sorted(samples)
+
+    def rank(p):
+        return ordered[min(len(ordered) - 1, max(0, round(p / 100 * len(ordered)) - 1))]
+
+    return {
+        "n": len(ordered),
+        "p50": round(rank(50), 2),
+        "p95": round(rank(95), 2),
+        "p99": round(rank(99), 2),
+        "mean": round(sum(ordered) / len(ordered), 2),
+        "max": round(ordered[-1], 2),
+    }
+
+
+def deep_sizeof(obj, seen=None):
+    """Approximate retained size of an object graph (containers and slots)."""
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, (str, bytes, bytearray, array, int, float)):
+        return size
+    if isinstance(obj, dict):
+        return size + sum(deep_sizeof(k, seen) + deep_sizeof(v, seen) for k, v in obj.items())
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return size + sum(deep_sizeof(v, seen) for v in obj)
+    for slot in getattr(type(obj), "__slots__", ()):
+        if slot != "checklist":  # shared by every session
+            size += deep_sizeof(getattr(obj, slot, None), seen)
+    return size
+
+
+def _timed_run(at, timeout):
+    started = time.perf_counter()
+    at.run(timeout=timeout)
+    if at.exception:
+        raise RuntimeError(at.exception[0].value)
+    return (time.perf_counter() - started) * 1000
+
+
+def _widget(elements, label_prefix):
+    return next(el for el in elements if el.label.startswith(label_prefix))
+
+
+def reviewer(session_no, n_actions, seed, timeout):
+    """Drive one session; returns per-action timings in milliseconds."""
+    from streamlit.testing.v1 import AppTest
+
+    rng = random.Random(seed + session_no)
+    timings = {action: [] for action in ACTIONS}
+    # Pay for imports and process-wide caches once, as a running server would.
+    AppTest.from_file(str(APP_PATH), default_timeout=timeout).run()
+
+    at = AppTest.from_file(str(APP_PATH), default_timeout=timeout)
+    at.query_params["assessment"] = f"loadtest-{seed}-{session_no}"
+    first_paint = _timed_run(at, timeout)
+    # Sections start collapsed; reviewers open them before scoring.
+    _widget(at.button, EXPAND_LABEL).click()
+    first_render = _timed_run(at, timeout)
+
+    for action in rng.choices(ACTIONS, weights=ACTION_WEIGHTS, k=n_actions):
+        if action == "filter":
+            box = _widget(at.checkbox, FILTER_LABEL)
+            box.set_value(not box.value)
+        elif action == "submit":
+            _widget(at.button, SUBMIT_LABEL).click()
+        else:
+            visible = [sb.key for sb in at.selectbox if sb.key and sb.key.startswith("score_")]
+            if not visible:  # everything filtered away; clear the filter instead
+                action = "filter"
+                _widget(at.checkbox, FILTER_LABEL).uncheck()
+            else:
+                idx = int(rng.choice(visible).split("_")[1])
+                if action == "score":
+                    at.selectbox(key=f"score_{idx}").select(rng.choice((1, 2, 3)))
+                elif action == "tag":
+                    box = at.checkbox(key=f"tag_{idx}_{rng.randrange(3)}")
+                    box.set_value(not box.value)
+                else:
+                    at.text_area(key=f"comment_{idx}").input(f"reviewer {session_no} note {rng.random():.6f}")
+        timings[action].append(_timed_run(at, timeout))
+
+    state = at.session_state["assessment"] if "assessment" in at.session_state else None
+    return first_paint, first_render, timings, deep_sizeof(state) if state is not None else None
+
+
+def measure_session_memory(n_sessions, timeout):
+    """Traced Python heap per idle session after the first render (incl. harness)."""
+    from streamlit.testing.v1 import AppTest
+
+    warm = AppTest.from_file(str(APP_PATH), default_timeout=timeout)
+    warm.run()  # imports and process-wide caches are not per-session cost
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    held = []
+    for i in range(n_sessions):
+        at = AppTest.from_file(str(APP_PATH), default_timeout=timeout)
+        at.query_params["assessment"] = f"loadtest-mem-{i}"
+        at.run()
+        held.append(at)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    grown = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    return round(grown / n_sessions)
+
+
+def run(args):
+    first_paints, first_renders, state_sizes = [], [], []
+    by_action = {action: [] for action in ACTIONS}
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.sessions) as pool:
+        futures = [pool.submit(reviewer, n, args.actions, args.seed, args.timeout) for n in range(args.sessions)]
+        for future in futures:
+            first_paint, first_render, timings, state_size = future.result()
+            first_paints.append(first_paint)
+            first_renders.append(first_render)
+            if state_size is not None:
+                state_sizes.append(state_size)
+            for action, samples in timings.items():
+                by_action[action].extend(samples)
+    wall_time = time.perf_counter() - started
+
+    import streamlit
+
+    all_reruns = [ms for samples in by_action.values() for ms in samples]
+    return {
+        "config": {"sessions": args.sessions, "actions_per_session": args.actions, "seed": args.seed},
+        "environment": {
+            "python": platform.python_version(),
+            "streamlit": streamlit.__version__,
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+        },
+        "wall_time_s": round(wall_time, 2),
+        "first_paint_ms": percentiles(first_paints),
+        "first_render_ms": percentiles(first_renders),
+        "rerun_ms": percentiles(all_reruns),
+        "rerun_ms_by_action": {action: percentiles(samples) for action, samples in by_action.items()},
+        "memory": {
+            "assessment_state_bytes": round(sum(state_sizes) / len(state_sizes)) if state_sizes else None,
+            "traced_bytes_per_session": measure_session_memory(args.memory_sessions, args.timeout),
+        },
+    }
+
+
+def compare(result, baseline, tolerance):
+    """Return regressions of p95 latencies beyond ``tolerance`` (a fraction)."""
+    regressions = []
+    for metric in ("first_paint_ms", "first_render_ms", "rerun_ms"):
+        old, new = baseline.get(metric, {}).get("p95"), result[metric].get("p95")
+        if old and new and new > old * (1 + tolerance):
+            regressions.append(f"{metric} p95 {new} ms > baseline {old} ms (+{tolerance:.0%})")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=10, help="Concurrent reviewers.")
+    parser.add_argument("--actions", type=int, default=20, help="Interactions per reviewer.")
+    parser.add_argument("--memory-sessions", type=int, default=5, help="Idle sessions held for the memory probe.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--timeout", type=float, default=60, help="Seconds allowed per rerun.")
+    parser.add_argument("-o", "--output", help="Write the JSON report here (default: stdout).")
+    parser.add_argument("--baseline", help="Earlier report; exit 1 if p95 latency regressed.")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed p95 regression (default 0.2 = 20%%).")
+    args = parser.parse_args(argv)
+
+    # Keep the database out of the working tree; the autosave thread may
+    # still flush to it while the interpreter exits.
+    os.environ["STROBE_DB_PATH"] = os.path.join(tempfile.mkdtemp(prefix="strobe-loadtest-"), "loadtest.db")
+    result = run(args)
+
+    report = json.dumps(result, indent=2)
+    if args.output:
+        Path(args.output).write_text(report + "\n", encoding="utf-8")
+    else:
+        print(report)
+
+    if args.baseline:
+        regressions = compare(result, json.loads(Path(args.baseline).read_text(encoding="utf-8")), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION: {line}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
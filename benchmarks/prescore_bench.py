@@ -0,0 +1,130 @@
+"""Timing and consistency check for manuscript pre-scoring.
+
+Builds N synthetic manuscripts with IMRaD headings from reporting phrases
+that trigger (and overlap between) the checklist cues, pre-scores each
+with the combined per-section scan, and compares every suggestion with a
+reference that searches each item's cues one by one. Half the manuscripts
+open with a structured abstract; on its own, that abstract must fully
+address items 1a and 1b. Prints a JSON report in milliseconds and exits
+1 if any suggestion differs or the abstract check fails.
+
+    python benchmarks/prescore_bench.py --manuscripts 200
+"""
+
+import argparse
+import json
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from strobe.core import FULL_SCORE  # noqa: E402
+from strobe.prescore import (  # noqa: E402
+    EVIDENCE_CONTEXT,
+    cue_index,
+    split_imrad,
+    suggest_score,
+    suggest_tags,
+)
+from strobe.registry import get_checklist, registry  # noqa: E402
+
+# Sub-headings on their own lines, as most medical journals print them.
+STRUCTURED_ABSTRACT = """Outcomes after an index hospitalization
+Abstract
+Background
+Little is known about long-term outcomes.
+Methods
+This retrospective cohort study used electronic health records.
+Results
+Risk was higher in the exposed cohort.
+Conclusions
+Exposure was associated with worse outcomes.
+"""
+ABSTRACT_ITEMS = ("1a", "1b")
+
+HEADINGS = ("Introduction", "Methods", "Results", "Discussion", "Funding")
+PHRASES = (
+    "This retrospective cohort study used TriNetX electronic health records from 2015 to 2022.",
+    "Patients with at least one year of follow-up were eligible; those with prior cancer were excluded.",
+    "Exposures and outcomes were defined by ICD-10-CM and CPT codes listed in the supplementary table.",
+    "Models were adjusted for confounders, and propensity score matching used 1:1 nearest-neighbor greedy matching.",
+    "Baseline characteristics before and after matching are shown in Table 1 with standardized mean differences.",
+    "A flow diagram shows how many patients were excluded because of data quality.",
+    "Records were linked by deterministic linkage; linkage quality was assessed.",
+    "Hazard ratios with 95% confidence intervals came from Cox regression in R version 4.3.",
+    "Limitations include misclassification, unmeasured confounding and missing data.",
+    "Our findings are consistent with previous studies but may not apply to other settings.",
+    "The study was funded by a grant; the funders had no role in the analysis.",
+    "Data are available upon reasonable request; the IRB waived consent for de-identified data.",
+    "Median follow-up was 3.2 years (n = 12,408) and incidence rates were 4.1 per 1,000 person-years.",
+)
+
+
+def manuscript(rng, n_sentences):
+    parts = [STRUCTURED_ABSTRACT if rng.random() < 0.5 else " ".join(rng.choices(PHRASES, k=n_sentences))]
+    for heading in HEADINGS:
+        parts.append(f"\n{heading}\n" + " ".join(rng.choices(PHRASES, k=n_sentences)))
+    return "\n".join(parts)
+
+
+def reference_suggest(checklist, text):
+    """Pre-scoring with every cue of every item searched on its own."""
+    index = cue_index(checklist)
+    parts = split_imrad(text)
+    suggestions = []
+    for item in checklist.items:
+        haystack = index._search_text(item.section, parts, text)
+        evidence = []
+        for cue in item.cues:
+            match = re.search(cue, haystack, re.IGNORECASE)
+            if match:
+                lo, hi = max(0, match.start() - EVIDENCE_CONTEXT), match.end() + EVIDENCE_CONTEXT
+                evidence.append(" ".join(haystack[lo:hi].split()))
+        score = suggest_score(len(evidence), item)
+        suggestions.append((item.index, score, suggest_tags(score, item), len(evidence), tuple(evidence)))
+    return suggestions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--manuscripts", type=int, default=200, help="Synthetic manuscripts per checklist.")
+    parser.add_argument("--sentences", type=int, default=40, help="Sentences per manuscript part.")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    texts = [manuscript(rng, args.sentences) for _ in range(args.manuscripts)]
+    report, mismatches = {"manuscripts": args.manuscripts}, []
+    for info in registry.available():
+        checklist = get_checklist(info.id)
+        index = cue_index(checklist)
+        started = time.perf_counter()
+        combined = [index.suggest(text) for text in texts]
+        combined_ms = (time.perf_counter() - started) * 1000
+        started = time.perf_counter()
+        reference = [reference_suggest(checklist, text) for text in texts]
+        reference_ms = (time.perf_counter() - started) * 1000
+        for n, (got, expected) in enumerate(zip(combined, reference)):
+            for suggestion, want in zip(got, expected):
+                if (suggestion.index, suggestion.score, suggestion.tags, suggestion.hits, suggestion.evidence) != want:
+                    item_id = checklist.items[suggestion.index].item_id
+                    mismatches.append(f"{info.id} manuscript {n}: item {item_id} differs from the per-cue scan")
+        report[info.id] = {"combined": round(combined_ms, 2), "per_cue": round(reference_ms, 2)}
+        abstract = index.suggest(STRUCTURED_ABSTRACT + "Introduction\nPrevious studies have shown little.\n")
+        for suggestion in abstract:
+            item_id = checklist.items[suggestion.index].item_id
+            if item_id in ABSTRACT_ITEMS and suggestion.score != FULL_SCORE:
+                mismatches.append(f"{info.id} structured abstract: item {item_id} scored {suggestion.score}")
+    report["mismatches"] = len(mismatches)
+    print(json.dumps(report, indent=2))
+    for mismatch in mismatches[:20]:
+        print(f"FAIL: {mismatch}", file=sys.stderr)
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
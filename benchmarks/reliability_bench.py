@@ -0,0 +1,67 @@
+"""Timing benchmark for the inter-rater reliability engine.
+
+Simulates N double-reviewed manuscripts whose raters agree with a latent
+true score most of the time, then times the per-paper statistics and the
+full item and section report with bootstrap intervals. Prints a JSON
+report in milliseconds.
+
+    python benchmarks/reliability_bench.py --papers 20000 --bootstrap 1000
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from strobe.registry import get_checklist  # noqa: E402
+from strobe.reliability import RatingSet, paper_statistics, reliability_report  # noqa: E402
+
+
+def simulate(n_papers, n_raters, n_items, agreement, seed):
+    rng = np.random.default_rng(seed)
+    truth = rng.integers(1, 4, (n_papers, 1, n_items))
+    noise = rng.integers(1, 4, (n_papers, n_raters, n_items))
+    return np.where(rng.random(noise.shape) < agreement, truth, noise).astype(np.int8)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--papers", type=int, default=20_000, help="Simulated manuscripts.")
+    parser.add_argument("--raters", type=int, default=2, help="Raters per manuscript.")
+    parser.add_argument("--bootstrap", type=int, default=1000, help="Bootstrap replicates.")
+    parser.add_argument("--agreement", type=float, default=0.7, help="Chance a rater reports the latent score.")
+    parser.add_argument("-c", "--checklist", default=None, help="Checklist ID (default: strobe).")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    checklist = get_checklist(args.checklist)
+    ratings = simulate(args.papers, args.raters, len(checklist), args.agreement, args.seed)
+    rating_set = RatingSet(tuple(range(args.papers)), (), ratings)
+
+    started = time.perf_counter()
+    paper_statistics(ratings)
+    statistics_ms = (time.perf_counter() - started) * 1000
+    started = time.perf_counter()
+    items, _sections = reliability_report(rating_set, checklist, n_boot=args.bootstrap, seed=args.seed)
+    report_ms = (time.perf_counter() - started) * 1000
+
+    print(json.dumps({
+        "papers": args.papers,
+        "rater_pairs": int(items["Rater pairs"].iloc[0]),
+        "items": len(checklist),
+        "bootstrap": args.bootstrap,
+        "paper_statistics": round(statistics_ms, 2),
+        "reliability_report": round(report_ms, 2),
+        "median_cohens_kappa": round(float(items["Cohen's kappa"].median()), 3),
+    }, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
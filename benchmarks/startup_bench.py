@@ -0,0 +1,104 @@
+"""Cold-start benchmark for the app, with a time budget.
+
+Each measurement runs in a fresh interpreter, as on a new replica:
+
+* ``import``: the app script's top-level imports (Streamlit included);
+* ``first_render``: the first full run of the script for a new session,
+  imports included, through Streamlit's test runner.
+
+After the first render none of the heavy modules only used on submit,
+analytics or exports (pandas, numpy, ...) may have been imported. Prints
+a JSON report in milliseconds (best of ``--repeat`` runs) and exits 1 if
+a budget is exceeded or a heavy module was loaded.
+
+    python benchmarks/startup_bench.py --import-budget 600 --render-budget 1000
+"""
+
+import argparse
+import ast
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+APP = REPO_ROOT / "TriNetXStrobeChecklist.py"
+HEAVY_MODULES = ("pandas", "numpy", "pyarrow", "openpyxl", "pypdf")
+
+
+def _top_level_imports(path):
+    tree = ast.parse(path.read_text(encoding="utf-8"))
+    nodes = [node for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))]
+    return compile(ast.Module(body=nodes, type_ignores=[]), str(path), "exec")
+
+
+def _child(phase):
+    """Run one measurement in this (fresh) interpreter and print it as JSON."""
+    sys.path.insert(0, str(REPO_ROOT))
+    if phase == "import":
+        code = _top_level_imports(APP)
+        started = time.perf_counter()
+        exec(code, {"__name__": "__startup_bench__"})
+    else:
+        from streamlit.testing.v1 import AppTest
+
+        app = AppTest.from_file(str(APP), default_timeout=60)
+        started = time.perf_counter()
+        app.run()
+        if app.exception:
+            raise SystemExit(f"first render failed: {app.exception[0].message}")
+    elapsed = (time.perf_counter() - started) * 1000
+    print(json.dumps({"ms": elapsed, "heavy": [name for name in HEAVY_MODULES if name in sys.modules]}))
+
+
+def measure(phase, repeat, env):
+    runs = []
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, __file__, "--child", phase],
+            env=env, cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+        )
+        runs.append(json.loads(result.stdout.strip().splitlines()[-1]))
+    return round(min(run["ms"] for run in runs), 1), sorted({name for run in runs for name in run["heavy"]})
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--import-budget", type=float, default=600, help="Budget for the app's imports (ms).")
+    parser.add_argument("--render-budget", type=float, default=1000, help="Budget for the first render (ms).")
+    parser.add_argument("--repeat", type=int, default=3, help="Fresh interpreters per measurement.")
+    parser.add_argument("--child", choices=("import", "render"), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    if args.child:
+        _child(args.child)
+        return 0
+
+    env = dict(os.environ, STROBE_DB_PATH=os.path.join(tempfile.mkdtemp(prefix="strobe-startup-"), "bench.db"))
+    env.pop("STROBE_PROFILE", None)
+    import_ms, _ = measure("import", args.repeat, env)
+    render_ms, heavy = measure("render", args.repeat, env)
+    report = {
+        "import": import_ms,
+        "first_render": render_ms,
+        "budget": {"import": args.import_budget, "first_render": args.render_budget},
+        "heavy_modules_loaded": heavy,
+    }
+    print(json.dumps(report, indent=2))
+
+    failures = []
+    if import_ms > args.import_budget:
+        failures.append(f"imports took {import_ms} ms (budget {args.import_budget} ms)")
+    if render_ms > args.render_budget:
+        failures.append(f"first render took {render_ms} ms (budget {args.render_budget} ms)")
+    if heavy:
+        failures.append(f"first render imported {', '.join(heavy)}")
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
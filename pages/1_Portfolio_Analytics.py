@@ -0,0 +1,110 @@
+import datetime
+
+import streamlit as st
+
+from strobe.aggregates import SCORE_LEVELS
+from strobe.analytics import (
+    item_distribution,
+    load_score_matrix,
+    score_counts,
+    section_distribution,
+    submission_trend,
+    top_shortfalls,
+    top_tags,
+)
+from strobe.registry import get_checklist, registry
+from strobe.store import AssessmentStore
+
+MATRIX_TTL = 60  # seconds a loaded score matrix is reused across sessions
+
+
+@st.cache_resource
+def get_store():
+    return AssessmentStore()
+
+
+@st.cache_data(ttl=MATRIX_TTL, show_spinner="Loading submitted assessments…")
+def get_score_matrix(checklist_id):
+    return load_score_matrix(get_store(), get_checklist(checklist_id))
+
+
+st.set_page_config(page_title="STROBE Portfolio Analytics", layout="wide")
+st.title("📊 Portfolio Analytics")
+st.caption("Scores of every submitted self-assessment, as of their latest submission.")
+
+# --- Filters ---
+col1, col2 = st.columns([1, 2])
+with col1:
+    checklist_id = st.selectbox(
+        "Checklist",
+        [info.id for info in registry.available()],
+        format_func=lambda checklist_id: registry.info(checklist_id).title,
+    )
+checklist = get_checklist(checklist_id)
+with col2:
+    all_time = st.toggle(
+        "All submissions", value=True,
+        help="All-time figures come from running totals kept on every submit; a date range rescans the submissions.",
+    )
+
+# All-time views read the running aggregates: a handful of rows per item,
+# however many assessments have been submitted.
+if all_time:
+    totals = get_store().load_aggregates(checklist)
+    n_assessments, counts = totals.n_submissions, totals.item_counts
+    matrix = None
+else:
+    matrix = get_score_matrix(checklist_id)
+    if len(matrix):
+        first_day = matrix.submitted_at.min().astype(datetime.date)
+        last_day = matrix.submitted_at.max().astype(datetime.date)
+        picked = st.date_input("Submitted between", value=(first_day, last_day), min_value=first_day, max_value=last_day)
+        if len(picked) == 2:
+            matrix = matrix.between(picked[0], datetime.datetime.combine(picked[1], datetime.time.max))
+    n_assessments, counts = len(matrix), score_counts(matrix)
+
+if not n_assessments:
+    st.info("No assessments have been submitted against this checklist in this period.")
+    st.stop()
+
+# --- Headline numbers ---
+if all_time:
+    fully_rate, mean_score = totals.fully_rate, totals.mean_score
+else:
+    n_scores = counts.sum()
+    fully_rate, mean_score = counts[:, -1].sum() / n_scores * 100, (counts * SCORE_LEVELS).sum() / n_scores
+m1, m2, m3 = st.columns(3)
+m1.metric("Assessments", f"{n_assessments:,}")
+m2.metric("Items fully addressed", f"{fully_rate:.1f}%")
+m3.metric("Mean score", f"{mean_score:.2f} / 3")
+
+# --- Distributions ---
+st.markdown("### Most common shortfalls")
+st.dataframe(top_shortfalls(counts, checklist), hide_index=True, width="stretch")
+
+if all_time:
+    st.markdown("### Most selected feedback tags")
+    st.dataframe(top_tags(totals.tag_counts, checklist), hide_index=True, width="stretch")
+
+st.markdown("### Score distribution by section")
+sections = section_distribution(counts, checklist)
+st.bar_chart(sections.set_index("Section").iloc[:, :3], horizontal=True)
+st.dataframe(sections, hide_index=True, width="stretch")
+
+st.markdown("### Score distribution by item")
+items = item_distribution(counts, checklist)
+st.bar_chart(items.set_index("Item").iloc[:, 1:4])
+st.dataframe(items, hide_index=True, width="stretch")
+
+# --- Trends ---
+st.markdown("### Trends by submission date")
+if st.checkbox("Show trends", value=not all_time, help="Trends scan every submission in the period."):
+    if matrix is None:
+        matrix = get_score_matrix(checklist_id)
+    freq = st.radio("Period", ["D", "W", "MS"], index=1, horizontal=True, format_func={"D": "Day", "W": "Week", "MS": "Month"}.get)
+    trend = submission_trend(matrix, freq)
+    t1, t2 = st.columns(2)
+    with t1:
+        st.bar_chart(trend["Submissions"])
+    with t2:
+        st.line_chart(trend["Percent fully addressed"])
@@ -0,0 +1 @@
+"""STROBE self-assessment tool: importable core and batch tooling."""
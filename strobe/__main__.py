@@ -0,0 +1,5 @@
+import sys
+
+from strobe.cli import main
+
+sys.exit(main())
@@ -0,0 +1,294 @@
+"""Running aggregates over submitted assessments, maintained on every submit.
+
+For each checklist version the store keeps per-item score counts,
+per-section score sums, per-tag selection counts and the number of items
+fully addressed. A submission only applies its difference to these
+tables: the previous submission of the same assessment is subtracted and
+the new one added, and entries that cancel out are never written, so a
+submit costs O(items) however much history there is.
+
+Aggregates are keyed by ``(checklist_id, checklist_version)``. Each
+version records its item-to-section layout, so a resubmission after a
+checklist upgrade can still subtract what the older version counted.
+
+An assessment's submission counts towards the aggregates once its tag
+snapshot is stored (``submitted_tags IS NOT NULL``); :func:`rebuild`
+recomputes everything from the submission snapshots and is what the
+consistency check compares against.
+"""
+
+from array import array
+from collections import Counter
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from strobe.core import FULL_SCORE, score_labels
+from strobe.model import MAX_TAG_OPTIONS
+
+SCORE_LEVELS = np.array(sorted(score_labels), dtype=np.int8)
+
+# Table -> key columns, value columns. Values are added on conflict.
+TABLES = {
+    "aggregate_totals": (("checklist_id", "checklist_version"), ("n_submissions", "n_full")),
+    "aggregate_item_scores": (("checklist_id", "checklist_version", "item_idx", "score"), ("n",)),
+    "aggregate_section_sums": (("checklist_id", "checklist_version", "section_idx"), ("score_sum", "n_scores", "n_full")),
+    "aggregate_tags": (("checklist_id", "checklist_version", "item_idx", "bit"), ("n",)),
+}
+
+
+def section_layout(checklist):
+    """Section index of every item, one byte per item."""
+    return bytes(item.section_index for item in checklist.items)
+
+
+@dataclass(frozen=True, slots=True)
+class Submission:
+    checklist_id: str
+    version: str
+    layout: bytes
+    scores: bytes  # int8 per item
+    tag_masks: bytes  # native uint32 per item
+
+    @classmethod
+    def of(cls, checklist, scores, tag_masks):
+        return cls(checklist.id, checklist.version, section_layout(checklist), bytes(scores), array("I", tag_masks).tobytes())
+
+
+def previous_submission(conn, assessment_id):
+    """The counted submission of an assessment, or ``None`` if it has none."""
+    row = conn.execute(
+        "SELECT a.checklist_id, a.checklist_version, t.section_layout, a.submitted_scores, a.submitted_tags"
+        " FROM assessments a JOIN aggregate_totals t USING (checklist_id, checklist_version)"
+        " WHERE a.assessment_id = ? AND a.submitted_tags IS NOT NULL",
+        (assessment_id,),
+    ).fetchone()
+    return Submission(*row) if row else None
+
+
+@dataclass
+class AggregateDelta:
+    """Signed changes per aggregate table, keyed like :data:`TABLES`."""
+
+    tables: dict = field(default_factory=lambda: {name: Counter() for name in TABLES})
+    layouts: dict = field(default_factory=dict)  # (checklist_id, version) -> section layout
+
+    def add(self, submission, sign):
+        key = (submission.checklist_id, submission.version)
+        self.layouts[key] = submission.layout
+        items, sections, tags = (
+            self.tables["aggregate_item_scores"],
+            self.tables["aggregate_section_sums"],
+            self.tables["aggregate_tags"],
+        )
+        masks = array("I")
+        masks.frombytes(submission.tag_masks)
+        n_full = 0
+        for idx, score in enumerate(submission.scores):
+            full = score == FULL_SCORE
+            n_full += full
+            items[(*key, idx, score), 0] += sign
+            section = (*key, submission.layout[idx])
+            sections[section, 0] += sign * score
+            sections[section, 1] += sign
+            sections[section, 2] += sign * full
+            mask, bit = masks[idx], 0
+            while mask:
+                if mask & 1:
+                    tags[(*key, idx, bit), 0] += sign
+                mask >>= 1
+                bit += 1
+        self.tables["aggregate_totals"][key, 0] += sign
+        self.tables["aggregate_totals"][key, 1] += sign * n_full
+
+    def rows(self, table):
+        """``key + values`` rows of the non-zero changes to ``table``."""
+        n_values = len(TABLES[table][1])
+        changes = {}
+        for (key, column), value in self.tables[table].items():
+            if value:
+                changes.setdefault(key, [0] * n_values)[column] = value
+        return [(*key, *values) for key, values in changes.items()]
+
+
+def submission_delta(old, new):
+    """The aggregate changes of replacing submission ``old`` (or nothing) by ``new``."""
+    delta = AggregateDelta()
+    if old is not None:
+        delta.add(old, -1)
+    delta.add(new, +1)
+    return delta
+
+
+def _upsert(table):
+    keys, values = TABLES[table]
+    # Totals also carry the version's section layout, set when the row is created.
+    extra = ("section_layout",) if table == "aggregate_totals" else ()
+    columns = keys + extra + values
+    updates = ", ".join(f"{column} = {column} + excluded.{column}" for column in values)
+    return (
+        f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+        f" ON CONFLICT ({', '.join(keys)}) DO UPDATE SET {updates}"
+    )
+
+
+def apply_delta(conn, delta):
+    """Add ``delta`` to the stored aggregates; the caller owns the transaction."""
+    conn.executemany(
+        _upsert("aggregate_totals"),
+        [(cid, version, delta.layouts[cid, version], *values) for cid, version, *values in delta.rows("aggregate_totals")],
+    )
+    for table in TABLES:
+        rows = delta.rows(table)
+        if rows and table != "aggregate_totals":
+            conn.executemany(_upsert(table), rows)
+
+
+# --- Reading ---
+
+@dataclass(frozen=True, slots=True)
+class Aggregates:
+    n_submissions: int
+    n_full: int
+    item_counts: np.ndarray  # (n_items, n_score_levels) submissions per score
+    section_sums: np.ndarray  # (n_sections, 3) score sum, scores counted, fully addressed
+    tag_counts: np.ndarray  # (n_items, MAX_TAG_OPTIONS) times each tag option was selected
+
+    @property
+    def fully_rate(self):
+        n_scores = int(self.item_counts.sum())
+        return 100 * self.n_full / n_scores if n_scores else float("nan")
+
+    @property
+    def mean_score(self):
+        n_scores = int(self.item_counts.sum())
+        return float((self.item_counts * SCORE_LEVELS).sum() / n_scores) if n_scores else float("nan")
+
+
+def load_aggregates(conn, checklist):
+    """Current aggregates of ``checklist`` at its current version."""
+    key = (checklist.id, checklist.version)
+    where = " WHERE checklist_id = ? AND checklist_version = ?"
+    totals = conn.execute("SELECT n_submissions, n_full FROM aggregate_totals" + where, key).fetchone() or (0, 0)
+    item_counts = np.zeros((len(checklist), len(SCORE_LEVELS)), dtype=np.int64)
+    for idx, score, n in conn.execute("SELECT item_idx, score, n FROM aggregate_item_scores" + where, key):
+        item_counts[idx, score - SCORE_LEVELS[0]] = n
+    section_sums = np.zeros((len(checklist.sections), 3), dtype=np.int64)
+    for idx, *sums in conn.execute(
+        "SELECT section_idx, score_sum, n_scores, n_full FROM aggregate_section_sums" + where, key
+    ):
+        section_sums[idx] = sums
+    tag_counts = np.zeros((len(checklist), MAX_TAG_OPTIONS), dtype=np.int64)
+    for idx, bit, n in conn.execute("SELECT item_idx, bit, n FROM aggregate_tags" + where, key):
+        tag_counts[idx, bit] = n
+    return Aggregates(totals[0], totals[1], item_counts, section_sums, tag_counts)
+
+
+# --- Rebuild and consistency ---
+
+def _stored_tables(conn):
+    tables = {}
+    for table, (keys, values) in TABLES.items():
+        rows = conn.execute(f"SELECT {', '.join(keys + values)} FROM {table}")
+        tables[table] = {
+            tuple(row[: len(keys)]): tuple(row[len(keys):]) for row in rows if any(row[len(keys):])
+        }
+    return tables
+
+
+def rebuild(conn, layouts):
+    """Recompute every aggregate table from the submission snapshots.
+
+    ``layouts`` maps ``(checklist_id, version)`` to a section layout for
+    versions that have no stored layout yet. Returns ``(tables, layouts,
+    skipped)``: tables in the shape of the stored ones, the layout of each
+    version, and the number of submissions whose version has no known
+    layout or whose snapshot does not fit it.
+    """
+    layouts = {**layouts, **{
+        (cid, version): layout
+        for cid, version, layout in conn.execute("SELECT checklist_id, checklist_version, section_layout FROM aggregate_totals")
+    }}
+    grouped = {}
+    skipped = 0
+    for cid, version, scores, tags in conn.execute(
+        "SELECT checklist_id, checklist_version, submitted_scores, submitted_tags FROM assessments"
+        " WHERE submitted_at IS NOT NULL"
+    ):
+        layout = layouts.get((cid, version))
+        if layout is None or len(scores) != len(layout):
+            skipped += 1
+            continue
+        group = grouped.setdefault((cid, version), ([], []))
+        group[0].append(scores)
+        group[1].append(tags if tags is not None else bytes(4 * len(scores)))
+
+    tables = {table: {} for table in TABLES}
+    for key, (score_blobs, tag_blobs) in grouped.items():
+        layout = np.frombuffer(layouts[key], dtype=np.uint8)
+        scores = np.frombuffer(b"".join(score_blobs), dtype=np.int8).reshape(len(score_blobs), len(layout))
+        masks = np.frombuffer(b"".join(tag_blobs), dtype=np.uint32).reshape(scores.shape)
+        full = scores == FULL_SCORE
+        tables["aggregate_totals"][key] = (len(scores), int(full.sum()))
+        for level, counts in zip(SCORE_LEVELS, (scores[:, :, None] == SCORE_LEVELS).sum(axis=0).T):
+            for idx in np.flatnonzero(counts):
+                tables["aggregate_item_scores"][(*key, int(idx), int(level))] = (int(counts[idx]),)
+        n_sections = int(layout.max()) + 1 if len(layout) else 0
+        sums = np.stack(
+            [
+                np.bincount(layout, weights=scores.sum(axis=0, dtype=np.int64), minlength=n_sections),
+                np.bincount(layout, minlength=n_sections) * len(scores),
+                np.bincount(layout, weights=full.sum(axis=0), minlength=n_sections),
+            ],
+            axis=1,
+        ).astype(np.int64)
+        for idx in np.flatnonzero(sums.any(axis=1)):
+            tables["aggregate_section_sums"][(*key, int(idx))] = tuple(int(v) for v in sums[idx])
+        for bit in range(MAX_TAG_OPTIONS):
+            counts = ((masks >> bit) & 1).sum(axis=0)
+            for idx in np.flatnonzero(counts):
+                tables["aggregate_tags"][(*key, int(idx), bit)] = (int(counts[idx]),)
+    return tables, layouts, skipped
+
+
+def check(conn, layouts=None):
+    """Compare stored aggregates with a rebuild from scratch.
+
+    Returns ``(mismatches, skipped)`` where each mismatch is a readable
+    line naming the table, key and the stored and rebuilt values.
+    """
+    rebuilt, _, skipped = rebuild(conn, layouts or {})
+    stored = _stored_tables(conn)
+    mismatches = []
+    for table in TABLES:
+        for key in sorted(stored[table].keys() | rebuilt[table].keys(), key=repr):
+            have, want = stored[table].get(key), rebuilt[table].get(key)
+            if have != want:
+                mismatches.append(f"{table} {key}: stored {have}, rebuilt {want}")
+    return mismatches, skipped
+
+
+def repair(conn, layouts=None):
+    """Replace the stored aggregates with a rebuild; the caller owns the transaction.
+
+    Submissions made before aggregates existed are marked as counted.
+    Returns the number of skipped submissions.
+    """
+    rebuilt, layouts, skipped = rebuild(conn, layouts or {})
+    for table in TABLES:
+        conn.execute(f"DELETE FROM {table}")
+    conn.executemany(
+        _upsert("aggregate_totals"),
+        [(*key, layouts[key], *values) for key, values in rebuilt["aggregate_totals"].items()],
+    )
+    for table in TABLES:
+        if table != "aggregate_totals" and rebuilt[table]:
+            conn.executemany(_upsert(table), [(*key, *values) for key, values in rebuilt[table].items()])
+    conn.execute(
+        "UPDATE assessments SET submitted_tags = zeroblob(4 * length(submitted_scores))"
+        " WHERE submitted_at IS NOT NULL AND submitted_tags IS NULL AND EXISTS ("
+        "SELECT 1 FROM aggregate_totals t WHERE t.checklist_id = assessments.checklist_id"
+        " AND t.checklist_version = assessments.checklist_version"
+        " AND length(t.section_layout) = length(assessments.submitted_scores))"
+    )
+    return skipped
@@ -0,0 +1,149 @@
+"""Portfolio analytics over every submitted assessment of a checklist.
+
+Submitted assessments are loaded into one columnar (assessments x items)
+int8 score matrix straight from the score blobs the store keeps per
+submission. Every aggregate below is a vectorized NumPy/pandas operation
+over that matrix, so the cost grows with the matrix size rather than with
+Python-level loops over assessments or rows.
+
+All-time distributions do not need the matrix at all: they are built from
+the per-item score counts that :mod:`strobe.aggregates` keeps up to date
+on every submit, so only date-filtered views and trends rescan history.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from strobe.aggregates import SCORE_LEVELS
+from strobe.core import FULL_SCORE, score_labels
+
+
+@dataclass(frozen=True, slots=True)
+class ScoreMatrix:
+    checklist_id: str
+    assessment_ids: np.ndarray  # (n_assessments,) object
+    submitted_at: np.ndarray  # (n_assessments,) datetime64[s]
+    scores: np.ndarray  # (n_assessments, n_items) int8
+
+    def __len__(self):
+        return len(self.assessment_ids)
+
+    def between(self, start=None, end=None):
+        """Assessments submitted in ``[start, end]`` (either bound optional)."""
+        mask = np.ones(len(self), dtype=bool)
+        if start is not None:
+            mask &= self.submitted_at >= np.datetime64(start, "s")
+        if end is not None:
+            mask &= self.submitted_at <= np.datetime64(end, "s")
+        return ScoreMatrix(self.checklist_id, self.assessment_ids[mask], self.submitted_at[mask], self.scores[mask])
+
+
+def load_score_matrix(store, checklist):
+    """Build the score matrix of every submitted assessment of ``checklist``.
+
+    Only submissions against the current checklist version are included,
+    the same ones the running aggregates of the all-time view count.
+    """
+    n_items = len(checklist)
+    ids, times, blobs = [], [], []
+    for aid, submitted_at, blob in store.iter_submissions(checklist.id, checklist.version):
+        if blob is not None and len(blob) == n_items:
+            ids.append(aid)
+            times.append(submitted_at)
+            blobs.append(blob)
+    scores = np.frombuffer(b"".join(blobs), dtype=np.int8).reshape(len(blobs), n_items)
+    submitted_at = np.array(times, dtype=np.float64).astype("datetime64[s]")
+    return ScoreMatrix(checklist.id, np.array(ids, dtype=object), submitted_at, scores)
+
+
+def score_counts(matrix):
+    """Per-item count of each score level, shape (n_items, n_levels)."""
+    return (matrix.scores[:, :, None] == SCORE_LEVELS).sum(axis=0)
+
+
+def item_distribution(counts, checklist):
+    """Per-item count of each score, plus the share scoring below 3.
+
+    ``counts`` comes from :func:`score_counts` or from the running
+    aggregates (:attr:`strobe.aggregates.Aggregates.item_counts`).
+    """
+    frame = pd.DataFrame(counts, columns=[score_labels[level] for level in SCORE_LEVELS])
+    frame.insert(0, "Item", [item.item_id for item in checklist.items])
+    frame.insert(1, "Section", [item.section for item in checklist.items])
+    _add_rates(frame, counts)
+    return frame
+
+
+def section_distribution(counts, checklist):
+    """Per-section count of each score and mean score, over all of its items."""
+    section_of_item = np.array([item.section_index for item in checklist.items])
+    n_sections = len(checklist.sections)
+    section_counts = np.stack(
+        [np.bincount(section_of_item, weights=counts[:, level], minlength=n_sections) for level in range(len(SCORE_LEVELS))],
+        axis=1,
+    ).astype(np.int64)
+    frame = pd.DataFrame(section_counts, columns=[score_labels[level] for level in SCORE_LEVELS])
+    frame.insert(0, "Section", [section.name for section in checklist.sections])
+    _add_rates(frame, section_counts)
+    return frame
+
+
+def top_shortfalls(counts, checklist, n=10):
+    """The ``n`` items that most often score below 3."""
+    frame = item_distribution(counts, checklist)
+    frame["Checklist Item"] = [item.text for item in checklist.items]
+    return frame.nlargest(n, "Below 3 (%)")[["Item", "Section", "Checklist Item", "Below 3 (%)", "Mean score"]]
+
+
+def top_tags(tag_counts, checklist, n=10):
+    """The ``n`` feedback tags selected most often, from the running aggregates."""
+    flat = np.argsort(tag_counts, axis=None)[::-1][:n]
+    rows = []
+    for idx, bit in zip(*np.unravel_index(flat, tag_counts.shape)):
+        if tag_counts[idx, bit] == 0:
+            break
+        item = checklist.items[idx]
+        rows.append({"Item": item.item_id, "Feedback tag": item.tag_options[bit], "Selected": int(tag_counts[idx, bit])})
+    return pd.DataFrame(rows, columns=["Item", "Feedback tag", "Selected"])
+
+
+def _add_rates(frame, counts):
+    total = counts.sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        frame["Below 3 (%)"] = np.round(100 * (total - counts[:, -1]) / total, 1)
+        frame["Mean score"] = np.round((counts * SCORE_LEVELS).sum(axis=1) / total, 2)
+
+
+def assessment_summaries(matrix):
+    """Per-assessment percent fully addressed and mean score, indexed by submission time."""
+    return pd.DataFrame(
+        {
+            "Assessment": matrix.assessment_ids,
+            "Percent fully addressed": 100 - _percent_below_full(matrix.scores, axis=1),
+            "Mean score": _mean(matrix.scores, axis=1),
+        },
+        index=pd.DatetimeIndex(matrix.submitted_at, name="Submitted"),
+    )
+
+
+def submission_trend(matrix, freq="W"):
+    """Submissions per period with the period's mean quality measures."""
+    summaries = assessment_summaries(matrix).drop(columns="Assessment")
+    resampled = summaries.resample(freq)
+    trend = resampled.mean().round(2)
+    trend.insert(0, "Submissions", resampled.size())
+    return trend
+
+
+def _percent_below_full(scores, axis):
+    if scores.shape[axis] == 0:
+        return np.full(scores.shape[1 - axis], np.nan)
+    return np.round(100 * (scores < FULL_SCORE).mean(axis=axis), 1)
+
+
+def _mean(scores, axis):
+    if scores.shape[axis] == 0:
+        return np.full(scores.shape[1 - axis], np.nan)
+    return np.round(scores.mean(axis=axis, dtype=np.float64), 2)
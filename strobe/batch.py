@@ -0,0 +1,82 @@
+"""Bulk scoring of assessment files across a process pool."""
+
+import csv
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+
+from strobe.core import load_assessment, summarize
+from strobe.registry import get_checklist
+
+ASSESSMENT_SUFFIXES = {".csv", ".json"}
+
+SUMMARY_CSV_COLUMNS = ["file", "n_items", "percent_fully", "average_score", "n_improvements", "error"]
+
+
+def check_root(root):
+    """Raise unless ``root`` is a readable directory; ``os.walk`` would silently yield nothing."""
+    if not Path(root).is_dir():
+        raise ValueError(f"{root}: not a directory")
+    with os.scandir(root):  # PermissionError for an unreadable directory
+        pass
+
+
+def iter_assessment_files(root):
+    """Yield assessment files under ``root`` in a stable order."""
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for name in sorted(filenames):
+            if Path(name).suffix.lower() in ASSESSMENT_SUFFIXES:
+                yield Path(dirpath) / name
+
+
+def score_file(path, checklist_id=None):
+    """Summarize one assessment file; errors are reported, not raised."""
+    checklist = get_checklist(checklist_id)  # cached per worker process
+    try:
+        scores, comments = load_assessment(path, checklist)
+        result = summarize(scores, comments, checklist).to_dict()
+    except (OSError, ValueError) as exc:
+        return {"file": str(path), "error": str(exc)}
+    return {"file": str(path), **result}
+
+
+class _JsonlSink:
+    def __init__(self, fh):
+        self.fh = fh
+
+    def write(self, result):
+        self.fh.write(json.dumps(result, ensure_ascii=False) + "\n")
+
+
+class _CsvSink:
+    def __init__(self, fh):
+        self.writer = csv.DictWriter(fh, fieldnames=SUMMARY_CSV_COLUMNS, extrasaction="ignore", lineterminator="\n")
+        self.writer.writeheader()
+
+    def write(self, result):
+        self.writer.writerow(result)
+
+
+def run_batch(root, output, checklist_id=None, workers=None, chunksize=16):
+    """Score every assessment under ``root`` and stream summaries to ``output``.
+
+    The output format follows the file extension: ``.csv`` writes one row
+    per file, anything else writes JSON lines. Returns ``(n_scored, n_failed)``.
+    """
+    check_root(root)
+    output = Path(output)
+    n_scored = n_failed = 0
+    with output.open("w", newline="", encoding="utf-8") as fh:
+        sink = _CsvSink(fh) if output.suffix.lower() == ".csv" else _JsonlSink(fh)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            score = partial(score_file, checklist_id=checklist_id)
+            for result in pool.map(score, iter_assessment_files(root), chunksize=chunksize):
+                sink.write(result)
+                if "error" in result:
+                    n_failed += 1
+                else:
+                    n_scored += 1
+    return n_scored, n_failed
@@ -0,0 +1,183 @@
+"""Command-line entry point: ``python -m strobe <command> ...``."""
+
+import argparse
+import sys
+
+# Kept in sync with strobe.export.EXPORT_FORMATS; listed here so the parser
+# does not import the exporters.
+EXPORT_FORMAT_NAMES = ("csv", "xlsx", "parquet", "json", "html", "pdf")
+
+
+def _cmd_score(args):
+    from strobe.batch import run_batch
+
+    try:
+        n_scored, n_failed = run_batch(
+            args.directory, args.output, checklist_id=args.checklist, workers=args.workers, chunksize=args.chunksize
+        )
+    except (OSError, ValueError) as exc:
+        print(exc, file=sys.stderr)
+        return 1
+    print(f"Scored {n_scored} assessment(s), {n_failed} failed -> {args.output}", file=sys.stderr)
+    return 1 if n_failed and args.strict else 0
+
+
+def _cmd_prescore(args):
+    from strobe.prescore import run_prescore
+
+    try:
+        n_scored, n_failed = run_prescore(args.directory, args.output, checklist_id=args.checklist, workers=args.workers)
+    except (OSError, ValueError) as exc:
+        print(exc, file=sys.stderr)
+        return 1
+    print(f"Pre-scored {n_scored} manuscript(s), {n_failed} failed -> {args.output}", file=sys.stderr)
+    return 1 if n_failed and args.strict else 0
+
+
+def _cmd_reliability(args):
+    from strobe.reliability import run_reliability
+
+    rating_set = run_reliability(
+        args.directory, args.output, checklist_id=args.checklist, workers=args.workers,
+        n_boot=args.bootstrap, confidence=args.confidence, weighting=args.weights, seed=args.seed,
+    )
+    for path, message in rating_set.errors:
+        print(f"skipped {message}", file=sys.stderr)
+    n_reviews = int((rating_set.ratings[:, :, 0] > 0).sum())
+    print(
+        f"Analysed {n_reviews} review(s) of {len(rating_set.papers)} manuscript(s),"
+        f" {len(rating_set.errors)} unreadable -> {args.output}",
+        file=sys.stderr,
+    )
+    return 1 if rating_set.errors and args.strict else 0
+
+
+def _cmd_export(args):
+    from strobe.export import EXPORT_FORMATS, ExportUnavailable, write_archive
+    from strobe.store import AssessmentStore
+
+    try:
+        EXPORT_FORMATS[args.format].check_available()
+    except ExportUnavailable as exc:
+        print(exc, file=sys.stderr)
+        return 1
+    store = AssessmentStore(args.db) if args.db else AssessmentStore()
+    ids = args.ids or None
+    if args.output == "-":
+        n_written = write_archive(store, sys.stdout.buffer, fmt=args.format, assessment_ids=ids)
+    else:
+        with open(args.output, "wb") as fh:
+            n_written = write_archive(store, fh, fmt=args.format, assessment_ids=ids)
+    print(f"Exported {n_written} assessment(s) as {args.format} -> {args.output}", file=sys.stderr)
+    return 0
+
+
+def _cmd_aggregates(args):
+    from strobe.aggregates import section_layout
+    from strobe.registry import get_checklist, registry
+    from strobe.store import AssessmentStore
+
+    store = AssessmentStore(args.db) if args.db else AssessmentStore()
+    # Versions nothing was submitted against yet get their layout from the registry.
+    layouts = {(info.id, info.version): section_layout(get_checklist(info.id)) for info in registry.available()}
+    if args.repair:
+        skipped = store.repair_aggregates(layouts)
+        print(f"Rebuilt aggregates; {skipped} submission(s) skipped (unknown checklist version).", file=sys.stderr)
+        return 0
+    mismatches, skipped = store.check_aggregates(layouts)
+    for line in mismatches:
+        print(line)
+    print(
+        f"{len(mismatches)} mismatch(es) between stored and rebuilt aggregates;"
+        f" {skipped} submission(s) skipped (unknown checklist version).",
+        file=sys.stderr,
+    )
+    return 1 if mismatches else 0
+
+
+def _cmd_import(args):
+    from strobe.importer import import_exports
+    from strobe.store import AssessmentStore
+
+    store = AssessmentStore(args.db) if args.db else AssessmentStore()
+    n_imported, errors = import_exports(store, args.path, checklist_id=args.checklist, batch_size=args.batch_size)
+    for name, message in errors:
+        print(f"skipped {message}", file=sys.stderr)
+    print(f"Imported {n_imported} assessment(s), {len(errors)} rejected -> {store.path}", file=sys.stderr)
+    return 1 if errors and args.strict else 0
+
+
+def _cmd_checklists(args):
+    from strobe.registry import registry
+
+    for info in registry.available():
+        marker = "*" if info.id == registry.default_id else " "
+        print(f"{marker} {info.id:<24} v{info.version}  {info.title}")
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="strobe", description="STROBE self-assessment tooling.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    score = sub.add_parser("score", help="Score a directory of assessment files (CSV/JSON).")
+    score.add_argument("directory", help="Directory searched recursively for *.csv and *.json files.")
+    score.add_argument("-o", "--output", required=True, help="Output file (.jsonl or .csv).")
+    score.add_argument("-c", "--checklist", help="Checklist ID the files were scored against (default: strobe).")
+    score.add_argument("-j", "--workers", type=int, default=None, help="Worker processes (default: CPU count).")
+    score.add_argument("--chunksize", type=int, default=16, help="Files handed to a worker at a time.")
+    score.add_argument("--strict", action="store_true", help="Exit non-zero if any file fails to score.")
+    score.set_defaults(func=_cmd_score)
+
+    prescore = sub.add_parser("prescore", help="Suggest scores and tags for a directory of manuscripts.")
+    prescore.add_argument("directory", help="Directory searched recursively for *.txt, *.md, *.docx and *.pdf files.")
+    prescore.add_argument("-o", "--output", required=True, help="JSON lines file to write.")
+    prescore.add_argument("-c", "--checklist", help="Checklist ID to pre-score against (default: strobe).")
+    prescore.add_argument("-j", "--workers", type=int, default=None, help="Worker processes (default: CPU count).")
+    prescore.add_argument("--strict", action="store_true", help="Exit non-zero if any manuscript cannot be read.")
+    prescore.set_defaults(func=_cmd_prescore)
+
+    reliability = sub.add_parser("reliability", help="Inter-rater agreement for manuscripts reviewed more than once.")
+    reliability.add_argument("directory", help="Directory with one subdirectory per manuscript, one CSV/JSON review per rater.")
+    reliability.add_argument("-o", "--output", required=True, help="CSV report of item and section agreement.")
+    reliability.add_argument("-c", "--checklist", help="Checklist ID the reviews were scored against (default: strobe).")
+    reliability.add_argument("-j", "--workers", type=int, default=None, help="Worker processes for reading reviews.")
+    reliability.add_argument("-b", "--bootstrap", type=int, default=1000, help="Bootstrap replicates (0 = no intervals).")
+    reliability.add_argument("--confidence", type=float, default=0.95, help="Confidence level of the intervals.")
+    reliability.add_argument("--weights", default="linear", choices=("linear", "quadratic"), help="Weighted kappa weights.")
+    reliability.add_argument("--seed", type=int, default=None, help="Seed for reproducible intervals.")
+    reliability.add_argument("--strict", action="store_true", help="Exit non-zero if any review cannot be read.")
+    reliability.set_defaults(func=_cmd_reliability)
+
+    export = sub.add_parser("export", help="Stream stored assessments into a zip archive.")
+    export.add_argument("-o", "--output", required=True, help="Zip file to write, or - for stdout.")
+    export.add_argument("-f", "--format", default="csv", choices=EXPORT_FORMAT_NAMES, help="Per-assessment file format.")
+    export.add_argument("--db", default=None, help="Assessment database (default: $STROBE_DB_PATH or strobe_assessments.db).")
+    export.add_argument("ids", nargs="*", help="Assessment IDs to export (default: all).")
+    export.set_defaults(func=_cmd_export)
+
+    imports = sub.add_parser("import", help="Merge exported CSV/JSON assessments into the assessment database.")
+    imports.add_argument("path", help="A directory, zip archive or single export; file names become assessment IDs.")
+    imports.add_argument("-c", "--checklist", help="Checklist the CSV exports were scored against (default: strobe).")
+    imports.add_argument("--db", default=None, help="Assessment database (default: $STROBE_DB_PATH or strobe_assessments.db).")
+    imports.add_argument("--batch-size", type=int, default=200, help="Assessments written per transaction.")
+    imports.add_argument("--strict", action="store_true", help="Exit non-zero if any file is rejected.")
+    imports.set_defaults(func=_cmd_import)
+
+    aggregates = sub.add_parser("aggregates", help="Check the running aggregates against a rebuild from scratch.")
+    aggregates.add_argument("--db", default=None, help="Assessment database (default: $STROBE_DB_PATH or strobe_assessments.db).")
+    aggregates.add_argument("--repair", action="store_true", help="Replace the stored aggregates with the rebuild.")
+    aggregates.set_defaults(func=_cmd_aggregates)
+
+    checklists = sub.add_parser("checklists", help="List the registered checklists.")
+    checklists.set_defaults(func=_cmd_checklists)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,177 @@
+"""Streamlit-free core of the STROBE self-assessment tool.
+
+Holds the scoring logic shared by the Streamlit app and the command-line
+batch scorer. Functions taking a ``checklist`` accept any compiled
+checklist from :mod:`strobe.registry`.
+"""
+
+import csv
+import io
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+
+score_labels = {1: "1 = Not addressed", 2: "2 = Partially", 3: "3 = Fully addressed"}
+score_colors = {1: "#e74c3c", 2: "#f1c40f", 3: "#2ecc40"}  # Red, Yellow, Green
+
+DEFAULT_SCORE = 2
+FULL_SCORE = 3
+
+EXPORT_COLUMNS = ["Section", "Checklist Item", "Score", "Comments", "Guidance Link"]
+
+
+def ordered_sections(items):
+    """Return section names of raw item dictionaries in first-appearance order."""
+    sections = []
+    for item in items:
+        if item["section"] not in sections:
+            sections.append(item["section"])
+    return sections
+
+
+@dataclass
+class AssessmentSummary:
+    n_items: int
+    percent_fully: float
+    average_score: float
+    improvements: list = field(default_factory=list)
+
+    def to_dict(self):
+        return {
+            "n_items": self.n_items,
+            "percent_fully": self.percent_fully,
+            "average_score": self.average_score,
+            "n_improvements": len(self.improvements),
+            "improvements": self.improvements,
+        }
+
+
+def build_rows(scores, comments, checklist):
+    """One export row per checklist item, in checklist order."""
+    return [
+        {
+            "Section": item.section,
+            "Checklist Item": item.text,
+            "Score": scores[item.index],
+            "Comments": comments[item.index],
+            "Guidance Link": item.link,
+        }
+        for item in checklist.items
+    ]
+
+
+def summarize(scores, comments, checklist):
+    """Percent fully addressed, average score and the areas for improvement."""
+    n_items = len(checklist)
+    if len(scores) != n_items or len(comments) != n_items:
+        raise ValueError(
+            f"expected {n_items} scores and comments, got {len(scores)} and {len(comments)}"
+        )
+    n_fully = sum(1 for s in scores if s == FULL_SCORE)
+    improvements = [row for row in build_rows(scores, comments, checklist) if row["Score"] < FULL_SCORE]
+    return AssessmentSummary(
+        n_items=n_items,
+        percent_fully=round(100 * n_fully / n_items, 1),
+        average_score=round(sum(scores) / n_items, 2),
+        improvements=improvements,
+    )
+
+
+def rows_to_csv(rows):
+    """Serialize export rows the same way the app's CSV download does."""
+    buf = io.StringIO()
+    writer = csv.DictWriter(buf, fieldnames=EXPORT_COLUMNS, lineterminator="\n")
+    writer.writeheader()
+    writer.writerows(rows)
+    return buf.getvalue()
+
+
+# --- Reading assessment files ---
+
+def _coerce_score(value, where):
+    try:
+        score = int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{where}: score {value!r} is not an integer") from None
+    if score not in score_labels:
+        raise ValueError(f"{where}: score {score} is outside 1-3")
+    return score
+
+
+def iter_row_items(rows, checklist, source="<rows>"):
+    """Yield ``(item_idx, score, comment)`` for export-style rows.
+
+    Rows are matched by their "Checklist Item" text through the
+    checklist's hashed lookup; rows without that column are taken in
+    checklist order. Every item must have exactly one row: a repeated
+    item raises ``ValueError`` when it is reached, missing items once
+    the rows run out.
+    """
+    n_items = len(checklist)
+    seen = bytearray(n_items)
+    for pos, row in enumerate(rows):
+        if not isinstance(row, dict):
+            raise ValueError(f"{source}: row {pos + 1} is not an object")
+        text = row.get("Checklist Item")
+        if text is None:
+            idx = pos
+            if idx >= n_items:
+                raise ValueError(f"{source}: more rows than checklist items")
+        else:
+            idx = checklist.item_lookup.get(text) if isinstance(text, str) else None
+            if idx is None:
+                raise ValueError(f"{source}: row {pos + 1} does not match any checklist item")
+        if seen[idx]:
+            raise ValueError(f"{source}: row {pos + 1} repeats item {checklist.items[idx].item_id}")
+        seen[idx] = 1
+        comment = row.get("Comments") or ""
+        if not isinstance(comment, str):
+            raise ValueError(f"{source}: row {pos + 1}: comment {comment!r} is not text")
+        yield idx, _coerce_score(row.get("Score"), f"{source}: row {pos + 1}"), comment
+    missing = [checklist.items[idx].item_id for idx in range(n_items) if not seen[idx]]
+    if missing:
+        shown = ", ".join(missing[:5]) + (", ..." if len(missing) > 5 else "")
+        raise ValueError(f"{source}: no rows for {len(missing)} of {n_items} checklist items ({shown})")
+
+
+def assessment_from_rows(rows, checklist, source="<rows>"):
+    """Map export-style rows back onto the checklist as ``(scores, comments)``."""
+    n_items = len(checklist)
+    scores = [DEFAULT_SCORE] * n_items
+    comments = [""] * n_items
+    for idx, score, comment in iter_row_items(rows, checklist, source):
+        scores[idx] = score
+        comments[idx] = comment
+    return scores, comments
+
+
+def load_assessment(path, checklist):
+    """Read an assessment from an exported CSV or a JSON file.
+
+    JSON may either be a list of export rows or an object with parallel
+    ``scores`` and (optional) ``comments`` lists.
+    """
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix == ".csv":
+        with path.open(newline="", encoding="utf-8") as fh:
+            try:
+                return assessment_from_rows(csv.DictReader(fh), checklist, source=str(path))
+            except csv.Error as exc:
+                raise ValueError(f"{path}: malformed CSV ({exc})") from None
+    if suffix == ".json":
+        with path.open(encoding="utf-8") as fh:
+            data = json.load(fh)
+        if isinstance(data, list):
+            return assessment_from_rows(data, checklist, source=str(path))
+        if isinstance(data, dict) and "scores" in data:
+            scores, comments = data["scores"], data.get("comments") or [""] * len(checklist)
+            if not isinstance(scores, list) or not isinstance(comments, list):
+                raise ValueError(f"{path}: scores and comments must be lists")
+            if len(scores) != len(checklist) or len(comments) != len(checklist):
+                raise ValueError(f"{path}: expected {len(checklist)} scores and comments")
+            if not all(isinstance(comment, str) for comment in comments):
+                raise ValueError(f"{path}: comments must be text")
+            return [_coerce_score(s, f"{path}: item {i + 1}") for i, s in enumerate(scores)], list(comments)
+        raise ValueError(f"{path}: unrecognized JSON assessment layout")
+    raise ValueError(f"{path}: unsupported file type {suffix!r}")
@@ -0,0 +1,257 @@
+"""On-demand assessment exports, cached by the content hash of the assessment.
+
+Nothing is serialized until a format is actually requested. The result is
+kept in a process-wide LRU cache keyed by a digest of the checklist and
+the scores and comments, so repeated downloads of an unchanged assessment,
+from any session, are served without re-rendering.
+
+CSV, JSON and the printable HTML report only need the standard library;
+Parquet uses pyarrow (installed with Streamlit), XLSX needs openpyxl and
+PDF needs WeasyPrint.
+"""
+
+import hashlib
+import importlib.util
+import io
+import json
+import threading
+import zipfile
+from collections import OrderedDict
+from dataclasses import dataclass
+from html import escape
+
+from strobe.core import DEFAULT_SCORE, EXPORT_COLUMNS, build_rows, rows_to_csv, summarize
+
+
+class ExportUnavailable(RuntimeError):
+    """The optional dependency needed for an export format is not installed."""
+
+
+@dataclass(frozen=True, slots=True)
+class ExportFormat:
+    name: str
+    label: str
+    extension: str
+    mime: str
+    render: object  # (checklist, scores, comments) -> bytes
+    requires: str = None  # optional module the renderer imports
+
+    def is_available(self):
+        return self.requires is None or importlib.util.find_spec(self.requires) is not None
+
+    def check_available(self):
+        """Raise :class:`ExportUnavailable` unless the renderer's dependency is installed."""
+        if not self.is_available():
+            raise ExportUnavailable(f"{self.label} export needs {self.requires} (pip install {self.requires})")
+
+
+def assessment_digest(checklist, scores, comments):
+    """Stable content hash of everything an export depends on."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(f"{checklist.id}\x1f{checklist.version}\x1e".encode())
+    h.update(bytes(scores))
+    for comment in comments:
+        h.update(comment.encode())
+        h.update(b"\x1f")
+    return h.hexdigest()
+
+
+# --- Renderers ---
+
+def _render_csv(checklist, scores, comments):
+    return rows_to_csv(build_rows(scores, comments, checklist)).encode()
+
+
+def _render_json(checklist, scores, comments):
+    summary = summarize(scores, comments, checklist).to_dict()
+    del summary["improvements"]
+    document = {
+        "checklist": {"id": checklist.id, "version": checklist.version, "title": checklist.title},
+        "summary": summary,
+        "items": [
+            {
+                "id": item.item_id,
+                "section": item.section,
+                "item": item.text,
+                "score": scores[item.index],
+                "comment": comments[item.index],
+                "link": item.link,
+            }
+            for item in checklist.items
+        ],
+    }
+    return json.dumps(document, ensure_ascii=False, indent=2).encode()
+
+
+def _render_parquet(checklist, scores, comments):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ExportUnavailable("Parquet export needs pyarrow (pip install pyarrow)") from None
+    table = pa.Table.from_pylist(build_rows(scores, comments, checklist))
+    buf = io.BytesIO()
+    pq.write_table(table, buf)
+    return buf.getvalue()
+
+
+def _render_xlsx(checklist, scores, comments):
+    try:
+        from openpyxl import Workbook
+    except ImportError:
+        raise ExportUnavailable("XLSX export needs openpyxl (pip install openpyxl)") from None
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Self-Assessment")
+    sheet.append(EXPORT_COLUMNS)
+    for row in build_rows(scores, comments, checklist):
+        sheet.append([row[column] for column in EXPORT_COLUMNS])
+    buf = io.BytesIO()
+    workbook.save(buf)
+    return buf.getvalue()
+
+
+_REPORT_CSS = """
+body { font-family: -apple-system, "Segoe UI", Helvetica, Arial, sans-serif; margin: 2em; color: #222; }
+h1 { font-size: 1.5em; margin-bottom: 0.2em; }
+.meta { color: #555; margin-bottom: 1.5em; }
+table { border-collapse: collapse; width: 100%; font-size: 0.9em; }
+th, td { border: 1px solid #ccc; padding: 0.4em 0.6em; text-align: left; vertical-align: top; }
+th { background: #f4f4f4; }
+tr { page-break-inside: avoid; }
+.score { font-weight: bold; text-align: center; white-space: nowrap; }
+.s1 { color: #e74c3c; } .s2 { color: #b7950b; } .s3 { color: #27ae60; }
+.improvements { background: #fff8e1; border: 1px solid #f1c40f; padding: 0.5em 1.2em; margin: 1.5em 0; }
+@media print { body { margin: 0; } a { color: inherit; text-decoration: none; } }
+"""
+
+
+def render_report_html(checklist, scores, comments):
+    """Self-contained, printable HTML report including the areas for improvement."""
+    summary = summarize(scores, comments, checklist)
+    parts = [
+        "<!DOCTYPE html><html><head><meta charset='utf-8'>",
+        f"<title>STROBE Self-Assessment: {escape(checklist.title)}</title>",
+        f"<style>{_REPORT_CSS}</style></head><body>",
+        "<h1>STROBE Self-Assessment Report</h1>",
+        f"<div class='meta'>Checklist: {escape(checklist.title)} (v{escape(checklist.version)})<br>",
+        f"Percent fully addressed: <b>{summary.percent_fully}%</b> &middot; ",
+        f"Average score: <b>{summary.average_score} / 3</b></div>",
+    ]
+    if summary.improvements:
+        parts.append("<div class='improvements'><h2>Areas for Improvement</h2><ul>")
+        for row in summary.improvements:
+            parts.append(
+                f"<li><b>{escape(row['Section'])}</b>: "
+                f"<a href='{escape(row['Guidance Link'])}'>{escape(row['Checklist Item'])}</a>"
+                f"<br>Your score: {row['Score']}<br>Your comment: {escape(row['Comments'])}</li>"
+            )
+        parts.append("</ul></div>")
+    else:
+        parts.append("<p>All items fully addressed! ✅</p>")
+    parts.append("<table><thead><tr><th>Section</th><th>Checklist Item</th><th>Score</th><th>Comments</th></tr></thead><tbody>")
+    for item in checklist.items:
+        score = scores[item.index]
+        parts.append(
+            f"<tr><td>{escape(item.section)}</td><td>{escape(item.text)}</td>"
+            f"<td class='score s{score}'>{score}</td><td>{escape(comments[item.index])}</td></tr>"
+        )
+    parts.append("</tbody></table></body></html>")
+    return "".join(parts)
+
+
+def _render_html(checklist, scores, comments):
+    return render_report_html(checklist, scores, comments).encode()
+
+
+def _render_pdf(checklist, scores, comments):
+    try:
+        from weasyprint import HTML
+    except ImportError:
+        raise ExportUnavailable("PDF export needs WeasyPrint (pip install weasyprint)") from None
+    return HTML(string=render_report_html(checklist, scores, comments)).write_pdf()
+
+
+EXPORT_FORMATS = {
+    fmt.name: fmt
+    for fmt in (
+        ExportFormat("csv", "CSV", "csv", "text/csv", _render_csv),
+        ExportFormat(
+            "xlsx", "Excel", "xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            _render_xlsx, requires="openpyxl",
+        ),
+        ExportFormat("parquet", "Parquet", "parquet", "application/vnd.apache.parquet", _render_parquet, requires="pyarrow"),
+        ExportFormat("json", "JSON", "json", "application/json", _render_json),
+        ExportFormat("html", "HTML report", "html", "text/html", _render_html),
+        ExportFormat("pdf", "PDF report", "pdf", "application/pdf", _render_pdf, requires="weasyprint"),
+    )
+}
+
+
+# --- Cache ---
+
+class ExportCache:
+    """Thread-safe LRU of rendered exports keyed by ``(digest, format)``."""
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_render(self, key, render):
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+                return data
+        data = render()  # outside the lock; a concurrent miss just renders twice
+        with self._lock:
+            self._entries[key] = data
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return data
+
+
+export_cache = ExportCache()
+
+
+def export_assessment(fmt, checklist, scores, comments, cache=export_cache):
+    """Render one assessment in ``fmt``, reusing a cached copy of identical content."""
+    try:
+        export_format = EXPORT_FORMATS[fmt]
+    except KeyError:
+        raise ValueError(f"unknown export format {fmt!r}; choose from {', '.join(EXPORT_FORMATS)}") from None
+    key = (assessment_digest(checklist, scores, comments), fmt)
+    return cache.get_or_render(key, lambda: export_format.render(checklist, scores, comments))
+
+
+# --- Bulk export ---
+
+def write_archive(store, fileobj, fmt="csv", assessment_ids=None, get_checklist=None):
+    """Stream stored assessments into a zip archive, one file per assessment.
+
+    Assessments are read from the store and compressed one at a time, so
+    the archive is never assembled in memory; ``fileobj`` may be any
+    writable binary stream, including a non-seekable one. Returns the
+    number of assessments written. Raises :class:`ExportUnavailable` if
+    the format's optional dependency is not installed.
+    """
+    if get_checklist is None:
+        from strobe.registry import get_checklist
+    # Fail before the first byte is written rather than leave a truncated archive.
+    EXPORT_FORMATS[fmt].check_available()
+    extension = EXPORT_FORMATS[fmt].extension
+    n_written = 0
+    with zipfile.ZipFile(fileobj, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for aid, checklist_id, _version, rows in store.iter_assessments(assessment_ids):
+            checklist = get_checklist(checklist_id)
+            scores = [DEFAULT_SCORE] * len(checklist)
+            comments = [""] * len(checklist)
+            for idx, score, _mask, comment, _manual in rows:
+                if idx < len(checklist):
+                    scores[idx] = score
+                    comments[idx] = comment
+            # Bulk rendering bypasses the cache: each assessment is written once.
+            archive.writestr(f"{aid}.{extension}", EXPORT_FORMATS[fmt].render(checklist, scores, comments))
+            n_written += 1
+    return n_written
@@ -0,0 +1,185 @@
+"""Read exported assessments back in, one file or a whole archive at a time.
+
+An export carries each item's score and comment. Feedback tags are not
+exported separately, but a comment that was generated from tags is just
+the selected tags joined with ``"; "``, so a comment made up entirely of
+the item's tag options restores those tags; anything else is kept as a
+typed comment.
+
+Bulk imports stream: files are read one at a time from a directory or a
+zip archive, CSV rows are parsed lazily, and parsed assessments are
+merged into the store in fixed-size batches, so memory does not grow
+with the number of files.
+"""
+
+import csv
+import io
+import json
+import os
+import zipfile
+from pathlib import Path
+
+from strobe.core import iter_row_items
+from strobe.registry import ChecklistError, get_checklist, registry
+from strobe.state import TAG_SEPARATOR, AssessmentState
+
+IMPORT_SUFFIXES = {".csv", ".json"}
+
+
+def tags_from_comment(item, comment):
+    """The tags a generated comment was made of, or ``None`` for a typed comment."""
+    if not comment:
+        return ()
+    tags = comment.split(TAG_SEPARATOR)
+    if all(tag in item.tag_bits for tag in tags):
+        return tags
+    return None
+
+
+def _json_rows(document, source):
+    app_export = isinstance(document, dict) and isinstance(document.get("items"), list)
+    if not app_export and not isinstance(document, list):
+        raise ValueError(f"{source}: unrecognized JSON export layout")
+    entries = document["items"] if app_export else document
+    for pos, entry in enumerate(entries):
+        if not isinstance(entry, dict):
+            raise ValueError(f"{source}: entry {pos + 1} is not an object")
+    if not app_export:
+        return entries
+    # The app's JSON export.
+    return [
+        {"Checklist Item": item.get("item"), "Score": item.get("score"), "Comments": item.get("comment")}
+        for item in entries
+    ]
+
+
+def detect_checklist(rows, source):
+    """The checklist a full export was made from, judged by its item texts.
+
+    The default checklist wins ties; rows without item texts cannot be
+    told apart and fall back to the default.
+    """
+    texts = [row.get("Checklist Item") for row in rows]
+    if None in texts:
+        return get_checklist()
+    candidates = sorted(registry.available(), key=lambda info: info.id != registry.default_id)
+    for info in candidates:
+        checklist = get_checklist(info.id)
+        if len(checklist) == len(texts) and all(text in checklist.item_lookup for text in texts):
+            return checklist
+    raise ValueError(f"{source}: rows do not match any registered checklist; name the checklist explicitly")
+
+
+def read_export(fileobj, name, checklist=None):
+    """Parse one exported CSV or JSON file into an :class:`AssessmentState`.
+
+    ``fileobj`` is a binary file object. Rows are matched against
+    ``checklist`` when given; otherwise a JSON export's own checklist, or
+    for CSV the registered checklist whose items the rows match, is used.
+    Unknown items and invalid scores raise ``ValueError``.
+    """
+    suffix = Path(name).suffix.lower()
+    if suffix == ".csv":
+        # utf-8-sig also accepts files re-saved by spreadsheet programs.
+        text = io.TextIOWrapper(fileobj, encoding="utf-8-sig", newline="")
+        try:
+            rows = csv.DictReader(text)
+            if checklist is None:
+                # One export is at most a few dozen rows; hold them to identify the checklist.
+                rows = list(rows)
+                checklist = detect_checklist(rows, name)
+            return _state_from_rows(rows, checklist, name)
+        except csv.Error as exc:
+            raise ValueError(f"{name}: malformed CSV ({exc})") from None
+        finally:
+            text.detach()  # leave the caller's file object open
+    if suffix == ".json":
+        try:
+            document = json.load(fileobj)
+        except ValueError as exc:
+            raise ValueError(f"{name}: invalid JSON ({exc})") from None
+        if checklist is None and isinstance(document, dict) and isinstance(document.get("checklist"), dict):
+            try:
+                checklist_id = document["checklist"].get("id")
+                if checklist_id is not None and not isinstance(checklist_id, str):
+                    raise ChecklistError(f"unknown checklist {checklist_id!r}")
+                checklist = get_checklist(checklist_id)
+            except ChecklistError as exc:
+                raise ValueError(f"{name}: {exc}") from None
+        return _state_from_rows(_json_rows(document, name), checklist or get_checklist(), name)
+    raise ValueError(f"{name}: unsupported file type {suffix!r}")
+
+
+def _state_from_rows(rows, checklist, source):
+    state = AssessmentState(checklist)
+    for idx, score, comment in iter_row_items(rows, checklist, source):
+        state.set_score(idx, score)
+        tags = tags_from_comment(checklist.items[idx], comment)
+        if tags is not None:
+            state.set_tags(idx, tags)
+        state.set_comment(idx, comment)
+    return state
+
+
+# --- Bulk import ---
+
+def iter_export_files(path):
+    """Yield ``(name, opener)`` for every export in a directory or zip archive.
+
+    ``name`` is the path relative to ``path`` (or within the archive);
+    without its extension it serves as the assessment ID. ``opener()``
+    returns a binary file object.
+    """
+    path = Path(path)
+    if path.is_dir():
+        for dirpath, dirnames, filenames in os.walk(path):
+            dirnames.sort()
+            for filename in sorted(filenames):
+                file_path = Path(dirpath) / filename
+                if file_path.suffix.lower() in IMPORT_SUFFIXES:
+                    yield file_path.relative_to(path).as_posix(), lambda file_path=file_path: file_path.open("rb")
+    elif zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive:
+            for info in archive.infolist():
+                if not info.is_dir() and Path(info.filename).suffix.lower() in IMPORT_SUFFIXES:
+                    yield info.filename, lambda info=info: archive.open(info)
+    elif path.suffix.lower() in IMPORT_SUFFIXES:
+        yield path.name, lambda: path.open("rb")
+    else:
+        raise ValueError(f"{path}: not a directory, zip archive or CSV/JSON export")
+
+
+def import_exports(store, path, checklist_id=None, batch_size=200):
+    """Merge every export under ``path`` into ``store``.
+
+    Each file becomes (or updates) the assessment named after it, so an
+    archive written by ``python -m strobe export`` round-trips. A file is
+    rejected if its assessment already exists on a different checklist.
+    Returns ``(n_imported, errors)`` with errors as ``(name, message)``.
+    """
+    default_checklist = get_checklist(checklist_id) if checklist_id else None
+    n_imported, errors, batch = 0, [], {}
+
+    def flush():
+        if batch:
+            store.save_items(batch)
+            batch.clear()
+
+    for name, opener in iter_export_files(path):
+        assessment_id = str(Path(name).with_suffix(""))
+        try:
+            with opener() as fh:
+                state = read_export(fh, name, default_checklist)
+            stored = store.checklist_of(assessment_id)
+            if stored and stored[0] != state.checklist.id:
+                raise ValueError(f"{name}: assessment {assessment_id!r} is stored on checklist {stored[0]!r}")
+        except (OSError, ValueError) as exc:
+            errors.append((name, str(exc)))
+            continue
+        checklist = state.checklist
+        batch[assessment_id] = (checklist.id, checklist.version, [state.item_row(idx) for idx in range(len(state))])
+        n_imported += 1
+        if len(batch) >= batch_size:
+            flush()
+    flush()
+    return n_imported, errors
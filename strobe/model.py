@@ -0,0 +1,125 @@
+"""Immutable, precompiled checklist model shared by every session.
+
+The raw checklist definition is compiled once per process into frozen
+records with a section-to-item index, pre-rendered markup and tag lookup
+tables, so reruns only have to deal with what the reviewer changed.
+"""
+
+from dataclasses import dataclass
+from html import escape
+from types import MappingProxyType
+
+from strobe.core import ordered_sections, score_colors, score_labels
+
+MAX_TAG_OPTIONS = 16  # selected tags are stored as a per-item bitmask
+
+
+@dataclass(frozen=True, slots=True)
+class ChecklistItem:
+    index: int
+    item_id: str
+    section_index: int
+    section: str
+    text: str
+    guidance: str
+    link: str
+    tag_options: tuple
+    tag_bits: MappingProxyType  # tag text -> bit position
+    body_html: str
+    link_html: str
+    cues: tuple  # regex patterns the manuscript pre-scorer looks for
+    cues_full: int  # distinct cue hits needed to suggest "fully addressed"
+
+
+@dataclass(frozen=True, slots=True)
+class ChecklistSection:
+    index: int
+    name: str
+    anchor: str
+    anchor_html: str
+    toc_markdown: str
+    item_indices: tuple
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledChecklist:
+    id: str
+    version: str
+    title: str
+    items: tuple
+    sections: tuple
+    item_lookup: MappingProxyType  # item text -> item index
+    score_options: tuple
+    score_dot_html: MappingProxyType  # score -> coloured status dot
+
+    def __len__(self):
+        return len(self.items)
+
+    def format_score(self, score):
+        return score_labels[score]
+
+
+def compile_checklist(raw_items, checklist_id, version, title):
+    """Build a :class:`CompiledChecklist` from checklist dictionaries."""
+    section_names = ordered_sections(raw_items)
+    section_pos = {name: i for i, name in enumerate(section_names)}
+    members = [[] for _ in section_names]
+
+    items = []
+    for idx, raw in enumerate(raw_items):
+        sec_idx = section_pos[raw["section"]]
+        members[sec_idx].append(idx)
+        tag_options = tuple(raw["tag_options"])
+        if len(tag_options) > MAX_TAG_OPTIONS:
+            raise ValueError(f"item {idx + 1} has more than {MAX_TAG_OPTIONS} tag options")
+        items.append(
+            ChecklistItem(
+                index=idx,
+                item_id=raw["id"],
+                section_index=sec_idx,
+                section=raw["section"],
+                text=raw["item"],
+                guidance=raw["guidance"],
+                link=raw["link"],
+                tag_options=tag_options,
+                tag_bits=MappingProxyType({tag: bit for bit, tag in enumerate(tag_options)}),
+                body_html=(
+                    f"<span style='font-weight:bold;'>{escape(raw['item'], quote=False)}</span>"
+                    f"<br><span style='font-size:0.85em; color: #555;'>{escape(raw['guidance'], quote=False)}</span>"
+                ),
+                link_html=(
+                    f"<a href='{escape(raw['link'])}' style='font-size:0.85em;' target='_blank'>"
+                    f"[{escape(raw.get('link_label', 'STROBE Guidance'), quote=False)}]</a>"
+                ),
+                cues=tuple(raw.get("cues", ())),
+                cues_full=raw.get("cues_full", 1),
+            )
+        )
+
+    sections = []
+    for sec_idx, name in enumerate(section_names):
+        anchor = name.replace(" ", "-")
+        sections.append(
+            ChecklistSection(
+                index=sec_idx,
+                name=name,
+                anchor=anchor,
+                anchor_html=f'<a name="{anchor}"></a>',
+                toc_markdown=f"- [{name}](#{anchor})",
+                item_indices=tuple(members[sec_idx]),
+            )
+        )
+
+    return CompiledChecklist(
+        id=checklist_id,
+        version=version,
+        title=title,
+        items=tuple(items),
+        sections=tuple(sections),
+        item_lookup=MappingProxyType({item.text: item.index for item in items}),
+        score_options=tuple(score_labels),
+        score_dot_html=MappingProxyType(
+            {score: f"<span style='font-size:1.5em; color:{color};'>●</span>" for score, color in score_colors.items()}
+        ),
+    )
+
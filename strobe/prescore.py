@@ -0,0 +1,298 @@
+"""Manuscript pre-scoring: suggest scores and feedback tags from the paper text.
+
+A manuscript (plain text, DOCX, or the text layer of a PDF) is split into
+IMRaD sections by its headings. Each checklist item carries ``cues`` —
+regular expressions for the reporting it asks for, such as "95% confidence
+interval" or "flow diagram". For every checklist section the cues of all
+its items are compiled into one combined pattern, so each part of the
+manuscript is scanned in a single pass however many items look at it.
+"""
+
+import json
+import os
+import re
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+from xml.etree import ElementTree
+
+from strobe.batch import check_root
+from strobe.core import FULL_SCORE
+from strobe.registry import get_checklist
+
+MANUSCRIPT_SUFFIXES = {".txt", ".md", ".docx", ".pdf"}
+
+EVIDENCE_CONTEXT = 60  # characters kept either side of a cue match
+ABSTRACT_MAX_WORDS = 600  # a structured abstract and its sub-headings fit in this
+
+
+class ExtractUnavailable(RuntimeError):
+    """The optional dependency needed to read a manuscript format is missing."""
+
+
+# --- Text extraction ---
+
+_DOCX_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+
+def _docx_text(data):
+    try:
+        with zipfile.ZipFile(data) as archive:
+            root = ElementTree.fromstring(archive.read("word/document.xml"))
+    except (zipfile.BadZipFile, KeyError, ElementTree.ParseError) as exc:
+        raise ValueError(f"not a readable DOCX file ({exc})") from None
+    return "\n".join(
+        "".join(node.text or "" for node in para.iter(f"{_DOCX_NS}t")) for para in root.iter(f"{_DOCX_NS}p")
+    )
+
+
+def _pdf_text(data):
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        raise ExtractUnavailable("reading PDF manuscripts needs pypdf (pip install pypdf)") from None
+    return "\n".join(page.extract_text() or "" for page in PdfReader(data).pages)
+
+
+def extract_text(fileobj, filename):
+    """Plain text of a manuscript given as a binary file object.
+
+    Raises ``ValueError`` for unsupported or unreadable files and
+    :class:`ExtractUnavailable` when PDF support is not installed.
+    """
+    suffix = Path(filename).suffix.lower()
+    if suffix == ".docx":
+        return _docx_text(fileobj)
+    if suffix == ".pdf":
+        return _pdf_text(fileobj)
+    if suffix in (".txt", ".md"):
+        return fileobj.read().decode("utf-8", errors="replace")
+    raise ValueError(f"{filename}: unsupported manuscript type {suffix!r}")
+
+
+# --- IMRaD splitting ---
+
+_HEADINGS = {
+    "abstract": r"abstract|summary",
+    "introduction": r"introduction|background",
+    "methods": r"(?:materials and |patients and )?methods?|methodology|study design(?: and [a-z ]+)?",
+    "results": r"results|findings",
+    "discussion": r"discussion|conclusions?|comment",
+    "other": (
+        r"funding(?: sources?| statement)?|acknowledge?ments?|declarations?|conflicts? of interest"
+        r"|competing interests?|author contributions|data (?:availability|sharing)(?: statement)?"
+        r"|ethics(?: statement| approval)?|role of the funding source"
+    ),
+    "supplement": r"supplement(?:ary|al)?(?: materials?| appendix| tables?| methods)?|appendix",
+    "references": r"references|bibliography|works cited",
+}
+
+# A heading is a whole line, optionally numbered ("2." / "2.1" / "II.") and
+# optionally followed by a colon.
+_HEADING_RE = re.compile(
+    r"^[ \t]*(?:(?:\d+(?:\.\d+)*|[IVX]+)\.?[ \t]+)?(?:"
+    + "|".join(f"(?P<{key}>{pattern})" for key, pattern in _HEADINGS.items())
+    + r")[ \t]*:?[ \t]*$",
+    re.IGNORECASE | re.MULTILINE,
+)
+
+_ABSTRACT_SUBHEADINGS = {"introduction", "methods", "results", "discussion"}
+
+# Which manuscript parts are searched for the items of each checklist section.
+SECTION_SOURCES = {
+    "Title and Abstract": ("abstract",),
+    "Introduction": ("introduction",),
+    "Methods": ("methods", "supplement"),
+    "Results": ("results", "supplement"),
+    "Discussion": ("discussion",),
+    "Other Information": ("other",),
+}
+
+
+def split_imrad(text):
+    """Map IMRaD part -> text. Everything before the first heading counts as
+    title and abstract; references are dropped.
+
+    A structured abstract has its own Background/Methods/Results/Conclusions
+    sub-headings. They stay in the abstract until the body starts: at an
+    explicit Introduction, at a part seen for the second time, or once the
+    text so far is longer than an abstract.
+    """
+    segments = []  # (part, heading, text)
+    key, heading, start = "abstract", "", 0
+    for match in _HEADING_RE.finditer(text):
+        segments.append((key, heading, text[start:match.start()]))
+        key, heading, start = match.lastgroup, match.group(match.lastgroup), match.end()
+    segments.append((key, heading, text[start:]))
+
+    seen, n_words = set(), 0
+    for n, (key, heading, chunk) in enumerate(segments):
+        n_words += len(chunk.split())
+        if key != "abstract":
+            if key not in _ABSTRACT_SUBHEADINGS or key in seen or heading.lower() == "introduction":
+                break
+            if n_words > ABSTRACT_MAX_WORDS:
+                break
+            # The sub-heading itself is what item 1b looks for.
+            segments[n] = ("abstract", heading, f"{heading}\n{chunk}")
+        seen.add(key)
+
+    parts = {}
+    for key, _heading, chunk in segments:
+        parts.setdefault(key, []).append(chunk)
+    parts.pop("references", None)
+    return {key: "\n".join(chunks) for key, chunks in parts.items() if any(c.strip() for c in chunks)}
+
+
+# --- Compiled cue index ---
+
+@dataclass(frozen=True, slots=True)
+class ItemSuggestion:
+    index: int
+    score: int
+    tags: tuple
+    hits: int
+    evidence: tuple  # short excerpts around the first match of each cue
+
+
+class CueIndex:
+    """Per-section combined cue patterns for one checklist.
+
+    Items often share a cue (``follow[- ]up``, ``adjust(ed|ment)``, ICD
+    codes), and cues overlap. Each section is therefore scanned once with
+    a lookahead alternation of its distinct cues, which stops at every
+    position where any cue matches; there, every cue not yet found is
+    tried, and a hit counts for every item that has that cue.
+    """
+
+    def __init__(self, checklist):
+        self.checklist = checklist
+        self.sections = {}  # section name -> (combined pattern, cue patterns, (item, cue) owners per cue)
+        for section in checklist.sections:
+            owners = {}
+            for idx in section.item_indices:
+                for k, cue in enumerate(checklist.items[idx].cues):
+                    owners.setdefault(cue, []).append((idx, k))
+            if owners:
+                cues = list(owners)
+                combined = "|".join(f"(?:{cue})" for cue in cues)
+                self.sections[section.name] = (
+                    re.compile(f"(?=(?:{combined}))", re.IGNORECASE),
+                    [re.compile(cue, re.IGNORECASE) for cue in cues],
+                    list(owners.values()),
+                )
+
+    def _search_text(self, section_name, parts, full_text):
+        sources = SECTION_SOURCES.get(section_name, ())
+        found = [parts[key] for key in sources if key in parts]
+        # Without a matching heading, fall back to the whole manuscript.
+        return "\n".join(found) if found else full_text
+
+    def suggest(self, text):
+        """One :class:`ItemSuggestion` per checklist item."""
+        parts = split_imrad(text)
+        first_hits = {}  # (item, cue) -> evidence excerpt
+        for section_name, (combined, cues, owners) in self.sections.items():
+            haystack = self._search_text(section_name, parts, text)
+            pending = set(range(len(cues)))
+            for match in combined.finditer(haystack):
+                start = match.start()
+                for j in list(pending):
+                    found = cues[j].match(haystack, start)
+                    if found is None:
+                        continue
+                    pending.discard(j)
+                    lo, hi = max(0, start - EVIDENCE_CONTEXT), found.end() + EVIDENCE_CONTEXT
+                    excerpt = " ".join(haystack[lo:hi].split())
+                    for key in owners[j]:
+                        first_hits[key] = excerpt
+                if not pending:
+                    break
+
+        suggestions = []
+        for item in self.checklist.items:
+            evidence = tuple(first_hits[item.index, k] for k in range(len(item.cues)) if (item.index, k) in first_hits)
+            score = suggest_score(len(evidence), item)
+            suggestions.append(ItemSuggestion(item.index, score, suggest_tags(score, item), len(evidence), evidence))
+        return suggestions
+
+
+def suggest_score(hits, item):
+    if not item.cues:
+        return 2
+    if hits >= min(item.cues_full, len(item.cues)):
+        return FULL_SCORE
+    return 2 if hits else 1
+
+
+def suggest_tags(score, item):
+    """Tag options run from "not addressed" to "fully addressed"; pick the matching one."""
+    options = item.tag_options
+    return (options[round((score - 1) * (len(options) - 1) / (FULL_SCORE - 1))],)
+
+
+_cue_indexes = {}
+
+
+def cue_index(checklist):
+    """The compiled :class:`CueIndex` for a checklist, built once per process."""
+    index = _cue_indexes.get(checklist.id)
+    if index is None or index.checklist is not checklist:
+        index = _cue_indexes[checklist.id] = CueIndex(checklist)
+    return index
+
+
+def prescore_text(text, checklist):
+    return cue_index(checklist).suggest(text)
+
+
+# --- Batch pre-scoring ---
+
+def iter_manuscripts(root):
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for name in sorted(filenames):
+            if Path(name).suffix.lower() in MANUSCRIPT_SUFFIXES:
+                yield Path(dirpath) / name
+
+
+def prescore_file(path, checklist_id=None):
+    """Suggestions for one manuscript as a JSON-ready assessment dict."""
+    checklist = get_checklist(checklist_id)  # cached per worker process
+    try:
+        with open(path, "rb") as fh:
+            text = extract_text(fh, path.name)
+    except (OSError, ValueError, ExtractUnavailable) as exc:
+        return {"file": str(path), "error": str(exc)}
+    suggestions = prescore_text(text, checklist)
+    return {
+        "file": str(path),
+        "checklist": checklist.id,
+        "scores": [s.score for s in suggestions],
+        "tags": [list(s.tags) for s in suggestions],
+        "comments": ["; ".join(s.tags) for s in suggestions],
+        "evidence": [list(s.evidence) for s in suggestions],
+    }
+
+
+def run_prescore(root, output, checklist_id=None, workers=None, chunksize=4):
+    """Pre-score every manuscript under ``root`` in parallel, streaming JSON lines.
+
+    The output is a single ``.jsonl`` file, one object per manuscript.
+    A successful line carries ``scores`` and ``comments`` in the layout
+    ``python -m strobe score`` reads, but only once saved as its own
+    ``.json`` file. Returns ``(n_scored, n_failed)``.
+    """
+    check_root(root)
+    n_scored = n_failed = 0
+    with open(output, "w", encoding="utf-8") as fh, ProcessPoolExecutor(max_workers=workers) as pool:
+        work = partial(prescore_file, checklist_id=checklist_id)
+        for result in pool.map(work, iter_manuscripts(root), chunksize=chunksize):
+            fh.write(json.dumps(result, ensure_ascii=False) + "\n")
+            if "error" in result:
+                n_failed += 1
+            else:
+                n_scored += 1
+    return n_scored, n_failed
@@ -0,0 +1,247 @@
+"""Timing spans around the app's hot paths, off unless asked for.
+
+Each session owns a :class:`SpanRecorder`. While it is disabled,
+``recorder.span(...)`` returns a shared no-op context manager, so an
+instrumented block costs one attribute check. While enabled, every
+finished span is
+
+* kept in a short per-session history for the sidebar profiler panel,
+* observed in the process-wide :data:`metrics` histograms, which
+  :func:`start_metrics_server` serves in the Prometheus text format, and
+* when a trace file is configured, written out with the other spans of
+  its rerun as one JSON line once the outermost span of the rerun ends.
+
+Spans nest: the full-page rerun is the outermost span, and a section
+rerun on its own (a fragment rerun) is outermost for its trace line.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from statistics import median
+
+logger = logging.getLogger(__name__)
+
+PROFILE_ENV = "STROBE_PROFILE"  # "1" enables spans for every session by default
+TRACE_PATH_ENV = "STROBE_TRACE_PATH"  # JSONL trace file, appended to
+METRICS_PORT_ENV = "STROBE_METRICS_PORT"  # serve /metrics on this local port
+
+SPAN_HISTORY = 50  # durations kept per (stage, section) for the panel
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+def profiling_default():
+    return os.environ.get(PROFILE_ENV, "").lower() in ("1", "true", "yes", "on")
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def stop(self):
+        return 0.0
+
+
+NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("recorder", "stage", "section", "started")
+
+    def __init__(self, recorder, stage, section):
+        self.recorder = recorder
+        self.stage = stage
+        self.section = section
+        self.started = None
+
+    def __enter__(self):
+        self.recorder._open += 1
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
+
+    def stop(self):
+        """End the span and return its duration in milliseconds."""
+        if self.started is None:
+            return 0.0
+        elapsed = time.perf_counter() - self.started
+        self.started = None
+        self.recorder._finish(self.stage, self.section, elapsed)
+        return elapsed * 1000
+
+
+# --- Per-session recorder ---
+
+class SpanRecorder:
+    def __init__(self, enabled=False, trace=None, labels=None):
+        self.enabled = enabled
+        self.trace = trace  # a TraceWriter, or None
+        self.labels = labels or {}  # added to every trace line, e.g. the session
+        self.history = {}  # (stage, section) -> deque of milliseconds
+        self.last_ms = {}  # (stage, section) -> milliseconds of the latest span
+        self._open = 0
+        self._run = []
+
+    def span(self, stage, section=None):
+        if not self.enabled:
+            return NULL_SPAN
+        return _Span(self, stage, section)
+
+    def start(self, stage, section=None):
+        """Open a span that is ended with ``.stop()`` instead of a ``with`` block."""
+        if not self.enabled:
+            return NULL_SPAN
+        # A rerun cut short (st.stop, an exception) leaves spans open; start afresh.
+        self._open, self._run = 0, []
+        return self.span(stage, section).__enter__()
+
+    def _finish(self, stage, section, elapsed):
+        key = (stage, section)
+        ms = elapsed * 1000
+        history = self.history.get(key)
+        if history is None:
+            history = self.history[key] = deque(maxlen=SPAN_HISTORY)
+        history.append(ms)
+        self.last_ms[key] = ms
+        metrics.observe(stage, section, elapsed)
+        self._run.append({"stage": stage, "section": section, "ms": round(ms, 3)})
+        self._open -= 1
+        if self._open <= 0:
+            self._open = 0
+            run, self._run = self._run, []
+            if self.trace is not None:
+                self.trace.write({"ts": time.time(), **self.labels, "root": stage, "spans": run})
+
+    def summary(self):
+        """One row per (stage, section) for the profiler panel."""
+        return [
+            {
+                "Stage": stage,
+                "Section": section or "",
+                "Runs": len(history),
+                "Median (ms)": round(median(history), 2),
+                "Max (ms)": round(max(history), 2),
+                "Last (ms)": round(history[-1], 2),
+            }
+            for (stage, section), history in self.history.items()
+        ]
+
+
+# --- Trace file ---
+
+class TraceWriter:
+    """Append JSON lines to a file shared by every session of the process."""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def write(self, record):
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with self._lock, open(self.path, "a", encoding="utf-8") as fh:
+            fh.write(line)
+
+
+def trace_from_env():
+    path = os.environ.get(TRACE_PATH_ENV)
+    return TraceWriter(path) if path else None
+
+
+# --- Prometheus metrics ---
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class SpanMetrics:
+    """Process-wide duration histograms per (stage, section)."""
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self._series = {}  # (stage, section) -> [bucket counts..., count, sum]
+        self._lock = threading.Lock()
+
+    def observe(self, stage, section, seconds):
+        with self._lock:
+            series = self._series.get((stage, section))
+            if series is None:
+                series = self._series[stage, section] = [0] * (len(self.buckets) + 1) + [0.0]
+            for i, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    series[i] += 1
+            series[-2] += 1
+            series[-1] += seconds
+
+    def render(self):
+        """The histograms in the Prometheus text exposition format."""
+        lines = [
+            "# HELP strobe_span_duration_seconds Duration of instrumented app stages.",
+            "# TYPE strobe_span_duration_seconds histogram",
+        ]
+        with self._lock:
+            snapshot = {key: list(series) for key, series in self._series.items()}
+        for (stage, section), series in sorted(snapshot.items(), key=lambda kv: (kv[0][0], kv[0][1] or "")):
+            labels = f'stage="{_escape(stage)}",section="{_escape(section or "")}"'
+            for bound, count in zip(self.buckets, series):
+                lines.append(f'strobe_span_duration_seconds_bucket{{{labels},le="{bound}"}} {count}')
+            lines.append(f'strobe_span_duration_seconds_bucket{{{labels},le="+Inf"}} {series[-2]}')
+            lines.append(f"strobe_span_duration_seconds_sum{{{labels}}} {series[-1]:.6f}")
+            lines.append(f"strobe_span_duration_seconds_count{{{labels}}} {series[-2]}")
+        return "\n".join(lines) + "\n"
+
+
+metrics = SpanMetrics()
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = metrics.render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # scrapes every few seconds would flood the app log
+
+
+def start_metrics_server(port, host="127.0.0.1"):
+    """Serve ``/metrics`` from a daemon thread; returns the server.
+
+    Returns ``None`` if the port cannot be bound (e.g. another replica on
+    the same host holds it): metrics must never take the app down.
+    """
+    try:
+        server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    except (OSError, OverflowError) as exc:
+        logger.warning("Metrics endpoint not started on %s:%s: %s", host, port, exc)
+        return None
+    threading.Thread(target=server.serve_forever, name="strobe-metrics", daemon=True).start()
+    return server
+
+
+def metrics_port_from_env():
+    port = os.environ.get(METRICS_PORT_ENV)
+    if not port:
+        return None
+    try:
+        return int(port)
+    except ValueError:
+        logger.warning("Ignoring %s=%r: not a port number", METRICS_PORT_ENV, port)
+        return None
@@ -0,0 +1,188 @@
+"""Registry of checklist definitions stored as versioned JSON data files.
+
+``checklists/index.json`` lists the available checklists; a checklist file
+is only read, validated and compiled the first time it is requested, and
+the compiled model is then shared by every session in the process.
+
+A checklist file either lists its ``items`` in full or ``extends`` another
+checklist, replacing fields of inherited items via ``overrides`` (keyed by
+item ID) and inserting new items via ``additions`` (placed ``after`` an
+existing item ID, or at the end).
+"""
+
+import json
+import re
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+
+from strobe.model import compile_checklist
+
+CHECKLIST_DIR = Path(__file__).resolve().parent / "checklists"
+
+ITEM_FIELDS = ("id", "section", "item", "guidance", "link", "tag_options")
+OPTIONAL_ITEM_FIELDS = ("link_label", "cues", "cues_full")
+
+
+class ChecklistError(ValueError):
+    """A checklist definition is missing, malformed or inconsistent."""
+
+
+@dataclass(frozen=True, slots=True)
+class ChecklistInfo:
+    id: str
+    version: str
+    title: str
+    file: str
+
+
+class ChecklistRegistry:
+    def __init__(self, directory=CHECKLIST_DIR):
+        self.directory = Path(directory)
+        self._lock = threading.RLock()
+        self._index = None
+        self._raw = {}
+        self._compiled = {}
+
+    # --- Index ---
+
+    def _load_index(self):
+        with self._lock:
+            if self._index is None:
+                path = self.directory / "index.json"
+                try:
+                    data = json.loads(path.read_text(encoding="utf-8"))
+                    entries = {
+                        entry["id"]: ChecklistInfo(entry["id"], str(entry["version"]), entry["title"], entry["file"])
+                        for entry in data["checklists"]
+                    }
+                except (OSError, ValueError, KeyError, TypeError) as exc:
+                    raise ChecklistError(f"{path}: cannot read checklist index ({exc})") from exc
+                self._index = (data.get("default") or next(iter(entries)), entries)
+            return self._index
+
+    @property
+    def default_id(self):
+        return self._load_index()[0]
+
+    def available(self):
+        """Metadata for every registered checklist, without loading any of them."""
+        return list(self._load_index()[1].values())
+
+    def info(self, checklist_id):
+        try:
+            return self._load_index()[1][checklist_id]
+        except KeyError:
+            raise ChecklistError(f"unknown checklist {checklist_id!r}") from None
+
+    # --- Loading ---
+
+    def raw_items(self, checklist_id, _chain=()):
+        """Resolved, validated item dictionaries for a checklist."""
+        with self._lock:
+            if checklist_id not in self._raw:
+                if checklist_id in _chain:
+                    raise ChecklistError(f"checklist {checklist_id!r} extends itself via {' -> '.join(_chain)}")
+                self._raw[checklist_id] = self._read(checklist_id, (*_chain, checklist_id))
+            return self._raw[checklist_id]
+
+    def _read(self, checklist_id, chain):
+        info = self.info(checklist_id)
+        path = self.directory / info.file
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as exc:
+            raise ChecklistError(f"{path}: {exc}") from exc
+        if data.get("id") != checklist_id or str(data.get("version")) != info.version:
+            raise ChecklistError(f"{path}: id/version do not match the index entry for {checklist_id!r}")
+
+        if "extends" in data:
+            items = [dict(item) for item in self.raw_items(data["extends"], chain)]
+            _apply_overrides(items, data.get("overrides", {}), path)
+            _apply_additions(items, data.get("additions", []), path)
+        else:
+            items = [dict(item) for item in data.get("items", [])]
+        _validate(items, path)
+        return tuple(items)
+
+    def get(self, checklist_id=None):
+        """The compiled checklist, loaded and compiled once per process."""
+        checklist_id = checklist_id or self.default_id
+        with self._lock:
+            compiled = self._compiled.get(checklist_id)
+            if compiled is None:
+                info = self.info(checklist_id)
+                compiled = compile_checklist(
+                    self.raw_items(checklist_id), checklist_id=info.id, version=info.version, title=info.title
+                )
+                self._compiled[checklist_id] = compiled
+            return compiled
+
+
+def _item_position(items, item_id, path):
+    for pos, item in enumerate(items):
+        if item["id"] == item_id:
+            return pos
+    raise ChecklistError(f"{path}: no item with id {item_id!r}")
+
+
+def _apply_overrides(items, overrides, path):
+    for item_id, fields in overrides.items():
+        unknown = set(fields) - set(ITEM_FIELDS[1:]) - set(OPTIONAL_ITEM_FIELDS)
+        if unknown:
+            raise ChecklistError(f"{path}: override for {item_id!r} has unknown fields {sorted(unknown)}")
+        items[_item_position(items, item_id, path)].update(fields)
+
+
+def _apply_additions(items, additions, path):
+    for addition in additions:
+        item = {key: value for key, value in addition.items() if key != "after"}
+        if "after" in addition:
+            items.insert(_item_position(items, addition["after"], path) + 1, item)
+        else:
+            items.append(item)
+
+
+def _validate(items, path):
+    if not items:
+        raise ChecklistError(f"{path}: checklist has no items")
+    seen = set()
+    for pos, item in enumerate(items, start=1):
+        missing = [name for name in ITEM_FIELDS if name not in item]
+        if missing:
+            raise ChecklistError(f"{path}: item {pos} is missing {', '.join(missing)}")
+        if item["id"] in seen:
+            raise ChecklistError(f"{path}: duplicate item id {item['id']!r}")
+        seen.add(item["id"])
+        for name in (*ITEM_FIELDS[:-1], "link_label"):
+            if name in item and (not isinstance(item[name], str) or not item[name].strip()):
+                raise ChecklistError(f"{path}: item {item['id']!r} has an empty or non-text {name!r}")
+        tags = item["tag_options"]
+        if not isinstance(tags, list) or not tags or not all(isinstance(t, str) and t for t in tags):
+            raise ChecklistError(f"{path}: item {item['id']!r} needs a non-empty list of tag options")
+        if len(set(tags)) != len(tags):
+            raise ChecklistError(f"{path}: item {item['id']!r} has duplicate tag options")
+        _validate_cues(item, path)
+
+
+def _validate_cues(item, path):
+    """Cues are regular expressions used by the manuscript pre-scorer."""
+    cues = item.get("cues", [])
+    if not isinstance(cues, list) or not all(isinstance(cue, str) and cue for cue in cues):
+        raise ChecklistError(f"{path}: item {item['id']!r} cues must be a list of patterns")
+    for cue in cues:
+        try:
+            re.compile(cue)
+        except re.error as exc:
+            raise ChecklistError(f"{path}: item {item['id']!r} has an invalid cue {cue!r} ({exc})") from None
+    full = item.get("cues_full", 1)
+    if not isinstance(full, int) or full < 1:
+        raise ChecklistError(f"{path}: item {item['id']!r} cues_full must be a positive integer")
+
+
+registry = ChecklistRegistry()
+
+
+def get_checklist(checklist_id=None):
+    """Shortcut for ``registry.get``; ``None`` selects the default checklist."""
+    return registry.get(checklist_id)
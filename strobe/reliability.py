@@ -0,0 +1,253 @@
+"""Inter-rater reliability for manuscripts reviewed by two or more raters.
+
+Reviews are read from the same exported CSV/JSON files the app produces
+(their ``Score`` column), laid out as one directory per manuscript with
+one file per rater::
+
+    reviews/
+        paper-001/alice.csv
+        paper-001/bob.csv
+        paper-002/...
+
+All manuscripts are stacked into one (papers x raters x items) int8
+array, 0 marking a missing rating. Every statistic is computed from
+per-paper sufficient statistics (a 3x3 confusion matrix per item for
+each pair of rater positions, and the per-category rating counts Fleiss'
+kappa needs), so item and section figures for all papers and all rater
+pairs come out of a handful of array operations. Bootstrap confidence
+intervals resample papers: each replicate is a row of paper draw counts,
+and a whole chunk of replicates is evaluated at once as one matrix
+product with the per-paper statistics.
+
+With more than two raters per paper, Cohen's and weighted kappa pool
+every pair of rater positions (raters in file-name order), and percent
+agreement is the share of agreeing pairs.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from strobe.aggregates import SCORE_LEVELS
+from strobe.batch import ASSESSMENT_SUFFIXES
+from strobe.core import load_assessment
+from strobe.registry import get_checklist
+
+N_LEVELS = len(SCORE_LEVELS)
+METRICS = ("Percent agreement", "Cohen's kappa", "Weighted kappa", "Fleiss' kappa")
+BOOTSTRAP_CELLS = 1 << 22  # paper weights held in memory per bootstrap chunk
+
+
+def agreement_weights(kind="linear"):
+    """Agreement weight of every pair of score levels for weighted kappa."""
+    distance = np.abs(np.subtract.outer(np.arange(N_LEVELS), np.arange(N_LEVELS))) / (N_LEVELS - 1)
+    if kind == "linear":
+        return 1 - distance
+    if kind == "quadratic":
+        return 1 - distance**2
+    raise ValueError(f"unknown weighting {kind!r}; choose linear or quadratic")
+
+
+# --- Loading ---
+
+@dataclass(frozen=True, slots=True)
+class RatingSet:
+    papers: tuple  # paper names, one per row of ``ratings``
+    raters: tuple  # per paper, the rater names in column order
+    ratings: np.ndarray  # (n_papers, max_raters, n_items) int8, 0 = missing
+    errors: tuple = ()  # (file, message) of reviews that could not be read
+
+
+def _read_scores(path, checklist_id):
+    checklist = get_checklist(checklist_id)  # cached per worker process
+    try:
+        scores, _comments = load_assessment(path, checklist)
+    except (OSError, ValueError) as exc:
+        return str(exc)
+    return bytes(scores)
+
+
+def load_ratings(root, checklist_id=None, workers=None, chunksize=64):
+    """Read every ``<root>/<paper>/<rater>`` review into a :class:`RatingSet`."""
+    root = Path(root)
+    reviews = []  # (paper, rater, path)
+    for paper_dir in sorted(p for p in root.iterdir() if p.is_dir()):
+        for dirpath, dirnames, filenames in os.walk(paper_dir):
+            dirnames.sort()
+            for name in sorted(filenames):
+                if Path(name).suffix.lower() in ASSESSMENT_SUFFIXES:
+                    path = Path(dirpath) / name
+                    reviews.append((paper_dir.name, str(path.relative_to(paper_dir).with_suffix("")), path))
+
+    n_items = len(get_checklist(checklist_id))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(partial(_read_scores, checklist_id=checklist_id), [r[2] for r in reviews], chunksize=chunksize))
+
+    by_paper, errors = {}, []
+    for (paper, rater, path), result in zip(reviews, results):
+        if isinstance(result, str):
+            errors.append((str(path), result))
+        else:
+            by_paper.setdefault(paper, []).append((rater, result))
+    papers = tuple(by_paper)
+    max_raters = max((len(rows) for rows in by_paper.values()), default=0)
+    ratings = np.zeros((len(papers), max_raters, n_items), dtype=np.int8)
+    for p, rows in enumerate(by_paper.values()):
+        ratings[p, : len(rows)] = np.frombuffer(b"".join(scores for _, scores in rows), dtype=np.int8).reshape(len(rows), n_items)
+    raters = tuple(tuple(rater for rater, _ in rows) for rows in by_paper.values())
+    return RatingSet(papers, raters, ratings, tuple(errors))
+
+
+# --- Sufficient statistics ---
+
+def paper_statistics(ratings):
+    """Per-paper, per-item statistics every metric is computed from.
+
+    Returns ``(confusion, fleiss)``: ``confusion`` has shape
+    (n_papers, n_items, N_LEVELS**2), counting rater-position pairs by
+    (first rater's score, second rater's score); ``fleiss`` has shape
+    (n_papers, n_items, N_LEVELS + 3) holding, for papers rated at least
+    twice, [1, P_i, n_i1 .. n_ik, n_i] in Fleiss' notation, else zeros.
+    """
+    n_papers, n_raters, n_items = ratings.shape
+    levels = ratings.astype(np.intp) - int(SCORE_LEVELS[0])
+    first, second = np.triu_indices(n_raters, 1)
+    a, b = levels[:, first, :], levels[:, second, :]  # (n_papers, n_pairs, n_items)
+    valid = (a >= 0) & (b >= 0)
+    cell_base = (np.arange(n_papers)[:, None, None] * n_items + np.arange(n_items)) * N_LEVELS**2
+    cells = (cell_base + a * N_LEVELS + b)[valid]
+    confusion = np.bincount(cells, minlength=n_papers * n_items * N_LEVELS**2).reshape(n_papers, n_items, N_LEVELS**2)
+
+    counts = (ratings[:, :, :, None] == SCORE_LEVELS).sum(axis=1)  # (n_papers, n_items, N_LEVELS)
+    n = counts.sum(axis=-1)
+    rated = n >= 2
+    with np.errstate(invalid="ignore", divide="ignore"):
+        p_i = np.where(rated, ((counts**2).sum(axis=-1) - n) / (n * (n - 1)), 0.0)
+    fleiss = np.concatenate(
+        [rated[..., None], p_i[..., None], counts * rated[..., None], (n * rated)[..., None]], axis=-1
+    ).astype(np.float64)
+    return confusion.astype(np.float64), fleiss
+
+
+def agreement_metrics(confusion, fleiss, weights):
+    """All metrics from summed statistics; leading dimensions are kept.
+
+    ``confusion`` and ``fleiss`` are sums of :func:`paper_statistics` over
+    papers (and optionally bootstrap replicates or items); returns a
+    dict of arrays shaped like their leading dimensions.
+    """
+    table = confusion.reshape(*confusion.shape[:-1], N_LEVELS, N_LEVELS)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        p = table / table.sum(axis=(-1, -2))[..., None, None]
+        expected = p.sum(axis=-1)[..., :, None] * p.sum(axis=-2)[..., None, :]
+        observed_agree = np.trace(p, axis1=-2, axis2=-1)
+        expected_agree = np.trace(expected, axis1=-2, axis2=-1)
+        observed_weighted = (p * weights).sum(axis=(-1, -2))
+        expected_weighted = (expected * weights).sum(axis=(-1, -2))
+
+        p_bar = fleiss[..., 1] / fleiss[..., 0]
+        p_j = fleiss[..., 2 : 2 + N_LEVELS] / fleiss[..., -1:]
+        p_e = (p_j**2).sum(axis=-1)
+        return {
+            "Percent agreement": 100 * observed_agree,
+            "Cohen's kappa": (observed_agree - expected_agree) / (1 - expected_agree),
+            "Weighted kappa": (observed_weighted - expected_weighted) / (1 - expected_weighted),
+            "Fleiss' kappa": (p_bar - p_e) / (1 - p_e),
+        }
+
+
+# --- Bootstrap ---
+
+def bootstrap_metrics(confusion, fleiss, groupings, weights, n_boot=1000, seed=None):
+    """Metrics for ``n_boot`` resamples of the papers.
+
+    ``confusion`` / ``fleiss`` are per-paper statistics; each of
+    ``groupings`` is an (n_items, n_groups) 0/1 matrix pooling items
+    (identity for items, section membership for sections). Every grouping
+    is evaluated on the same replicates. Returns, per grouping, a dict of
+    (n_boot, n_groups) arrays.
+    """
+    rng = np.random.default_rng(seed)
+    n_papers, n_items = confusion.shape[:2]
+    stats = np.concatenate([confusion, fleiss], axis=-1).reshape(n_papers, -1)
+    n_conf = confusion.shape[-1]
+    chunk = max(1, BOOTSTRAP_CELLS // max(n_papers, 1))
+    results = [{metric: [] for metric in METRICS} for _ in groupings]
+    for start in range(0, n_boot, chunk):
+        size = min(chunk, n_boot - start)
+        # Row r counts how often each paper was drawn in replicate r.
+        draws = rng.integers(0, n_papers, (size, n_papers)) + np.arange(size)[:, None] * n_papers
+        paper_weights = np.bincount(draws.ravel(), minlength=size * n_papers).reshape(size, n_papers)
+        replicate = (paper_weights.astype(np.float64) @ stats).reshape(size, n_items, -1)
+        for group, result in zip(groupings, results):
+            pooled = np.einsum("rif,ig->rgf", replicate, group)
+            metrics = agreement_metrics(pooled[..., :n_conf], pooled[..., n_conf:], weights)
+            for metric in METRICS:
+                result[metric].append(metrics[metric])
+    return [{metric: np.concatenate(parts) for metric, parts in result.items()} for result in results]
+
+
+# --- Reports ---
+
+def _report(confusion, fleiss, group, labels, weights, boot, confidence):
+    pooled_conf = np.einsum("pif,ig->gf", confusion, group)
+    pooled_fleiss = np.einsum("pif,ig->gf", fleiss, group)
+    frame = labels.copy()
+    frame["Papers"] = (np.einsum("pif,ig->pg", confusion, group) > 0).sum(axis=0)
+    frame["Rater pairs"] = pooled_conf.sum(axis=-1).astype(np.int64)
+    point = agreement_metrics(pooled_conf, pooled_fleiss, weights)
+    tail = 100 * (1 - confidence) / 2
+    for metric in METRICS:
+        frame[metric] = np.round(point[metric], 3)
+        if boot is not None:
+            low, high = np.nanpercentile(boot[metric], [tail, 100 - tail], axis=0)
+            frame[f"{metric} CI low"] = np.round(low, 3)
+            frame[f"{metric} CI high"] = np.round(high, 3)
+    return frame
+
+
+def reliability_report(rating_set, checklist, n_boot=1000, confidence=0.95, weighting="linear", seed=None):
+    """Item-level and section-level agreement as two DataFrames.
+
+    Sections pool the ratings of all their items. Kappas are NaN where
+    they are undefined, e.g. when every rating of an item is the same.
+    """
+    weights = agreement_weights(weighting)
+    confusion, fleiss = paper_statistics(rating_set.ratings)
+    n_items = len(checklist)
+    by_item = np.eye(n_items)
+    by_section = np.zeros((n_items, len(checklist.sections)))
+    by_section[np.arange(n_items), [item.section_index for item in checklist.items]] = 1
+    boots = (
+        bootstrap_metrics(confusion, fleiss, (by_item, by_section), weights, n_boot, seed)
+        if n_boot and len(rating_set.papers) else (None, None)
+    )
+
+    item_labels = pd.DataFrame(
+        {"Item": [item.item_id for item in checklist.items], "Section": [item.section for item in checklist.items]}
+    )
+    items = _report(confusion, fleiss, by_item, item_labels, weights, boots[0], confidence)
+    section_labels = pd.DataFrame({"Section": [section.name for section in checklist.sections]})
+    sections = _report(confusion, fleiss, by_section, section_labels, weights, boots[1], confidence)
+    return items, sections
+
+
+def run_reliability(root, output, checklist_id=None, workers=None, n_boot=1000, confidence=0.95, weighting="linear", seed=None):
+    """Write item and section agreement for the reviews under ``root`` to a CSV.
+
+    Returns the :class:`RatingSet` that was analysed.
+    """
+    checklist = get_checklist(checklist_id)
+    rating_set = load_ratings(root, checklist_id, workers=workers)
+    items, sections = reliability_report(rating_set, checklist, n_boot, confidence, weighting, seed)
+    report = pd.concat(
+        [items.assign(Level="item"), sections.assign(Level="section", Item="")], ignore_index=True
+    )
+    report = report[["Level", "Item", "Section", *[c for c in items.columns if c not in ("Item", "Section")]]]
+    report.to_csv(output, index=False)
+    return rating_set
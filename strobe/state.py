@@ -0,0 +1,138 @@
+"""Compact per-session assessment state.
+
+One :class:`AssessmentState` replaces the parallel ``scores`` /
+``comments`` / ``selected_tags`` / ``manual_comment_edit`` lists: scores
+live in a small-int array, selected tags in a per-item bitmask over the
+item's ``tag_options``, comments as interned strings, and every mutation
+records the item in a dirty set so a rerun only reconciles what changed.
+Incomplete items (score below 3) are indexed per section and kept up to
+date on every score change, so filtering never has to scan the checklist.
+"""
+
+import sys
+from array import array
+
+from strobe.core import DEFAULT_SCORE, FULL_SCORE, score_labels
+
+TAG_SEPARATOR = "; "
+
+
+class AssessmentState:
+    __slots__ = ("checklist", "scores", "tag_masks", "comments", "manual", "dirty", "incomplete")
+
+    def __init__(self, checklist):
+        n_items = len(checklist)
+        self.checklist = checklist
+        self.scores = array("b", [DEFAULT_SCORE]) * n_items
+        self.tag_masks = array("I", [0]) * n_items
+        self.comments = [""] * n_items
+        self.manual = bytearray(n_items)  # 1 = comment was typed, not generated from tags
+        self.dirty = set()
+        self.incomplete = [set(section.item_indices) for section in checklist.sections]
+
+    def __len__(self):
+        return len(self.scores)
+
+    # --- Scores ---
+
+    def set_score(self, idx, score):
+        if score not in score_labels:
+            raise ValueError(f"score {score!r} is outside 1-3")
+        if self.scores[idx] != score:
+            self.scores[idx] = score
+            self._index_score(idx)
+            self.dirty.add(idx)
+
+    def is_complete(self, idx):
+        return self.scores[idx] == FULL_SCORE
+
+    def _index_score(self, idx):
+        incomplete = self.incomplete[self.checklist.items[idx].section_index]
+        if self.is_complete(idx):
+            incomplete.discard(idx)
+        else:
+            incomplete.add(idx)
+
+    def n_complete(self, section):
+        return len(section.item_indices) - len(self.incomplete[section.index])
+
+    def visible_items(self, section, incomplete_only=False):
+        """Item indices of a section to render, in checklist order."""
+        if not incomplete_only:
+            return section.item_indices
+        return sorted(self.incomplete[section.index])
+
+    # --- Tags ---
+
+    def has_tag(self, idx, bit):
+        return bool(self.tag_masks[idx] >> bit & 1)
+
+    def selected_tags(self, idx):
+        mask = self.tag_masks[idx]
+        return [tag for bit, tag in enumerate(self.checklist.items[idx].tag_options) if mask >> bit & 1]
+
+    def set_tag(self, idx, bit, checked):
+        """Tick or untick one tag; an untouched comment follows the tags."""
+        mask = self.tag_masks[idx]
+        new_mask = mask | (1 << bit) if checked else mask & ~(1 << bit)
+        if new_mask == mask:
+            return
+        self.tag_masks[idx] = new_mask
+        if not self.manual[idx]:
+            self.comments[idx] = sys.intern(self.auto_comment(idx))
+        self.dirty.add(idx)
+
+    def set_tags(self, idx, tags):
+        """Replace the selected tags of an item by their text."""
+        bits = self.checklist.items[idx].tag_bits
+        mask = 0
+        for tag in tags:
+            mask |= 1 << bits[tag]
+        if mask != self.tag_masks[idx]:
+            self.tag_masks[idx] = mask
+            if not self.manual[idx]:
+                self.comments[idx] = sys.intern(self.auto_comment(idx))
+            self.dirty.add(idx)
+
+    # --- Comments ---
+
+    def auto_comment(self, idx):
+        return TAG_SEPARATOR.join(self.selected_tags(idx))
+
+    def set_comment(self, idx, text):
+        """Store a comment; it counts as manual unless it equals the tag summary."""
+        self.manual[idx] = text != self.auto_comment(idx)
+        if self.comments[idx] != text:
+            self.comments[idx] = sys.intern(text)
+            self.dirty.add(idx)
+
+    # --- Persistence ---
+
+    def item_row(self, idx):
+        """``(item_idx, score, tag_mask, comment, manual)`` for the store."""
+        return (idx, self.scores[idx], self.tag_masks[idx], self.comments[idx], self.manual[idx])
+
+    def restore(self, rows):
+        """Load stored item rows without marking them dirty."""
+        n_items = len(self)
+        for idx, score, tag_mask, comment, manual in rows:
+            if 0 <= idx < n_items:
+                self.scores[idx] = score
+                self._index_score(idx)
+                self.tag_masks[idx] = tag_mask
+                self.comments[idx] = sys.intern(comment)
+                self.manual[idx] = bool(manual)
+
+    # --- Dirty tracking ---
+
+    def mark_all_dirty(self):
+        self.dirty.update(range(len(self)))
+
+    def pop_dirty(self, within=None):
+        """Return and clear dirty item indices, optionally only those in ``within``."""
+        if within is None:
+            dirty, self.dirty = self.dirty, set()
+            return sorted(dirty)
+        taken = sorted(self.dirty.intersection(within))
+        self.dirty.difference_update(taken)
+        return taken
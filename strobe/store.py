@@ -0,0 +1,346 @@
+"""SQLite persistence for assessments, with a coalescing background writer.
+
+Items are stored one row per (assessment, item) so that autosave only
+touches the items that changed. The database runs in WAL mode so the
+writer thread never blocks sessions restoring their state.
+"""
+
+import atexit
+import logging
+import os
+from contextlib import closing, contextmanager
+import sqlite3
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB_PATH = os.environ.get("STROBE_DB_PATH", "strobe_assessments.db")
+
+# Schema migrations, applied in order; PRAGMA user_version records how many ran.
+_MIGRATIONS = [
+    """
+    CREATE TABLE IF NOT EXISTS assessments (
+        assessment_id TEXT PRIMARY KEY,
+        created_at    REAL NOT NULL,
+        updated_at    REAL NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS assessment_items (
+        assessment_id TEXT    NOT NULL,
+        item_idx      INTEGER NOT NULL,
+        score         INTEGER NOT NULL,
+        tag_mask      INTEGER NOT NULL,
+        comment       TEXT    NOT NULL,
+        manual        INTEGER NOT NULL,
+        PRIMARY KEY (assessment_id, item_idx)
+    ) WITHOUT ROWID;
+    """,
+    # Assessments created before checklists were pluggable used generic STROBE 1.0.
+    """
+    ALTER TABLE assessments ADD COLUMN checklist_id TEXT NOT NULL DEFAULT 'strobe';
+    ALTER TABLE assessments ADD COLUMN checklist_version TEXT NOT NULL DEFAULT '1.0';
+    """,
+    # The score vector at submission is kept as one int8 blob per assessment,
+    # so analytics can load thousands of assessments as a single matrix.
+    """
+    ALTER TABLE assessments ADD COLUMN submitted_at REAL;
+    ALTER TABLE assessments ADD COLUMN submitted_scores BLOB;
+    CREATE INDEX IF NOT EXISTS assessments_submitted ON assessments (checklist_id, submitted_at);
+    """,
+    # Running aggregates, see strobe.aggregates. Earlier submissions have no
+    # tag snapshot and are not counted until the aggregates are repaired.
+    """
+    ALTER TABLE assessments ADD COLUMN submitted_tags BLOB;
+    CREATE TABLE IF NOT EXISTS aggregate_totals (
+        checklist_id      TEXT    NOT NULL,
+        checklist_version TEXT    NOT NULL,
+        section_layout    BLOB    NOT NULL,
+        n_submissions     INTEGER NOT NULL,
+        n_full            INTEGER NOT NULL,
+        PRIMARY KEY (checklist_id, checklist_version)
+    ) WITHOUT ROWID;
+    CREATE TABLE IF NOT EXISTS aggregate_item_scores (
+        checklist_id      TEXT    NOT NULL,
+        checklist_version TEXT    NOT NULL,
+        item_idx          INTEGER NOT NULL,
+        score             INTEGER NOT NULL,
+        n                 INTEGER NOT NULL,
+        PRIMARY KEY (checklist_id, checklist_version, item_idx, score)
+    ) WITHOUT ROWID;
+    CREATE TABLE IF NOT EXISTS aggregate_section_sums (
+        checklist_id      TEXT    NOT NULL,
+        checklist_version TEXT    NOT NULL,
+        section_idx       INTEGER NOT NULL,
+        score_sum         INTEGER NOT NULL,
+        n_scores          INTEGER NOT NULL,
+        n_full            INTEGER NOT NULL,
+        PRIMARY KEY (checklist_id, checklist_version, section_idx)
+    ) WITHOUT ROWID;
+    CREATE TABLE IF NOT EXISTS aggregate_tags (
+        checklist_id      TEXT    NOT NULL,
+        checklist_version TEXT    NOT NULL,
+        item_idx          INTEGER NOT NULL,
+        bit               INTEGER NOT NULL,
+        n                 INTEGER NOT NULL,
+        PRIMARY KEY (checklist_id, checklist_version, item_idx, bit)
+    ) WITHOUT ROWID;
+    """,
+]
+
+_UPSERT_ASSESSMENT = """
+INSERT INTO assessments (assessment_id, checklist_id, checklist_version, created_at, updated_at)
+VALUES (?, ?, ?, ?, ?)
+ON CONFLICT (assessment_id) DO UPDATE SET updated_at = excluded.updated_at
+"""
+
+_UPSERT_ITEM = """
+INSERT INTO assessment_items (assessment_id, item_idx, score, tag_mask, comment, manual)
+VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (assessment_id, item_idx) DO UPDATE SET
+    score = excluded.score,
+    tag_mask = excluded.tag_mask,
+    comment = excluded.comment,
+    manual = excluded.manual
+"""
+
+_UPSERT_SUBMISSION = """
+INSERT INTO assessments
+    (assessment_id, checklist_id, checklist_version, created_at, updated_at,
+     submitted_at, submitted_scores, submitted_tags)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (assessment_id) DO UPDATE SET
+    checklist_version = excluded.checklist_version,
+    updated_at = excluded.updated_at,
+    submitted_at = excluded.submitted_at,
+    submitted_scores = excluded.submitted_scores,
+    submitted_tags = excluded.submitted_tags
+"""
+
+
+@contextmanager
+def _immediate(conn):
+    """Run a block in a write transaction taken up front, so concurrent
+    writers queue on the lock instead of failing to upgrade a read."""
+    conn.isolation_level = None
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+
+
+class AssessmentStore:
+    """Assessments keyed by assessment ID in a local SQLite database."""
+
+    def __init__(self, path=DEFAULT_DB_PATH):
+        self.path = str(path)
+        with closing(self.connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._migrate(conn)
+
+    @staticmethod
+    def _migrate(conn):
+        # BEGIN IMMEDIATE serializes replicas that start against the same file.
+        with _immediate(conn):
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            for number, script in enumerate(_MIGRATIONS[version:], start=version + 1):
+                for statement in filter(str.strip, script.split(";")):
+                    conn.execute(statement)
+                conn.execute(f"PRAGMA user_version = {number}")
+
+    def connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def checklist_of(self, assessment_id):
+        """``(checklist_id, checklist_version)`` of a stored assessment, or ``None``."""
+        with closing(self.connect()) as conn:
+            return conn.execute(
+                "SELECT checklist_id, checklist_version FROM assessments WHERE assessment_id = ?", (assessment_id,)
+            ).fetchone()
+
+    def load_items(self, assessment_id):
+        """Return ``(item_idx, score, tag_mask, comment, manual)`` rows."""
+        with closing(self.connect()) as conn:
+            return conn.execute(
+                "SELECT item_idx, score, tag_mask, comment, manual FROM assessment_items"
+                " WHERE assessment_id = ? ORDER BY item_idx",
+                (assessment_id,),
+            ).fetchall()
+
+    def iter_assessments(self, assessment_ids=None):
+        """Yield ``(assessment_id, checklist_id, checklist_version, item rows)`` one assessment at a time.
+
+        Rows are streamed from a single cursor, so memory holds only the
+        assessment currently being yielded.
+        """
+        query = (
+            "SELECT a.assessment_id, a.checklist_id, a.checklist_version,"
+            " i.item_idx, i.score, i.tag_mask, i.comment, i.manual"
+            " FROM assessments a JOIN assessment_items i USING (assessment_id)"
+        )
+        params = ()
+        if assessment_ids is not None:
+            assessment_ids = list(assessment_ids)
+            query += f" WHERE a.assessment_id IN ({', '.join('?' * len(assessment_ids))})"
+            params = assessment_ids
+        query += " ORDER BY a.assessment_id, i.item_idx"
+        with closing(self.connect()) as conn:
+            current, rows = None, []
+            for aid, checklist_id, version, *row in conn.execute(query, params):
+                if current is not None and aid != current[0]:
+                    yield (*current, rows)
+                    rows = []
+                current = (aid, checklist_id, version)
+                rows.append(tuple(row))
+            if current is not None:
+                yield (*current, rows)
+
+    def record_submission(self, assessment_id, checklist, scores, tag_masks, submitted_at=None):
+        """Snapshot a submitted assessment and fold the change into the running aggregates.
+
+        Resubmitting replaces the snapshot; the aggregates receive only the
+        difference to the previous submission, in the same transaction.
+        """
+        from strobe import aggregates  # imports numpy; kept off the app's cold start
+
+        now = time.time()
+        submitted_at = now if submitted_at is None else submitted_at
+        new = aggregates.Submission.of(checklist, scores, tag_masks)
+        with closing(self.connect()) as conn, _immediate(conn):
+            old = aggregates.previous_submission(conn, assessment_id)
+            conn.execute(
+                _UPSERT_SUBMISSION,
+                (assessment_id, checklist.id, checklist.version, now, now, submitted_at, new.scores, new.tag_masks),
+            )
+            aggregates.apply_delta(conn, aggregates.submission_delta(old, new))
+
+    def load_aggregates(self, checklist):
+        """Running aggregates of the current version of ``checklist``."""
+        from strobe import aggregates
+        with closing(self.connect()) as conn:
+            return aggregates.load_aggregates(conn, checklist)
+
+    def check_aggregates(self, layouts=None):
+        """``(mismatches, skipped)`` between stored and rebuilt aggregates."""
+        from strobe import aggregates
+        with closing(self.connect()) as conn:
+            return aggregates.check(conn, layouts)
+
+    def repair_aggregates(self, layouts=None):
+        """Rebuild the aggregates from the submission snapshots; returns the skipped count."""
+        from strobe import aggregates
+        with closing(self.connect()) as conn, _immediate(conn):
+            return aggregates.repair(conn, layouts)
+
+    def iter_submissions(self, checklist_id, checklist_version):
+        """Yield ``(assessment_id, submitted_at, score blob)`` of submitted assessments, oldest first."""
+        with closing(self.connect()) as conn:
+            yield from conn.execute(
+                "SELECT assessment_id, submitted_at, submitted_scores FROM assessments"
+                " WHERE checklist_id = ? AND checklist_version = ? AND submitted_at IS NOT NULL"
+                " ORDER BY submitted_at",
+                (checklist_id, checklist_version),
+            )
+
+    def save_items(self, batches, conn=None):
+        """Upsert ``{assessment_id: (checklist_id, checklist_version, [item rows])}`` in one transaction."""
+        now = time.time()
+        own = conn is None
+        conn = self.connect() if own else conn
+        try:
+            with conn:
+                conn.executemany(
+                    _UPSERT_ASSESSMENT,
+                    [(aid, checklist_id, version, now, now) for aid, (checklist_id, version, _) in batches.items()],
+                )
+                conn.executemany(
+                    _UPSERT_ITEM, [(aid, *row) for aid, (_, _, rows) in batches.items() for row in rows]
+                )
+        finally:
+            if own:
+                conn.close()
+
+
+class AutosaveWriter:
+    """Coalesce item writes and flush them from a background thread.
+
+    ``submit`` only records the latest row per (assessment, item) under a
+    lock, so it costs next to nothing on the rerun path; the writer thread
+    batches whatever accumulated into one transaction every
+    ``flush_interval`` seconds.
+    """
+
+    def __init__(self, store, flush_interval=0.5):
+        self.store = store
+        self.flush_interval = flush_interval
+        self._pending = {}
+        self._checklists = {}  # assessment ID -> (checklist ID, version)
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()  # keeps batches in submission order
+        self._wake = threading.Event()
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name="strobe-autosave", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def submit(self, assessment_id, checklist, rows):
+        if not rows:
+            return
+        with self._lock:
+            self._checklists[assessment_id] = (checklist.id, checklist.version)
+            for row in rows:
+                self._pending[assessment_id, row[0]] = row
+        self._wake.set()
+
+    def _take(self):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            checklists, self._checklists = self._checklists, {}
+        batches = {}
+        for (aid, _), row in pending.items():
+            if aid not in batches:
+                batches[aid] = (*checklists[aid], [])
+            batches[aid][2].append(row)
+        return batches
+
+    def _requeue(self, batches):
+        with self._lock:
+            for aid, (checklist_id, version, rows) in batches.items():
+                self._checklists.setdefault(aid, (checklist_id, version))
+                for row in rows:
+                    self._pending.setdefault((aid, row[0]), row)
+        self._wake.set()
+
+    def _run(self):
+        conn = self.store.connect()
+        try:
+            while not self._stopped:
+                self._wake.wait()
+                self._wake.clear()
+                time.sleep(self.flush_interval)  # let a burst of edits coalesce
+                with self._write_lock:
+                    batches = self._take()
+                    if batches:
+                        try:
+                            self.store.save_items(batches, conn)
+                        except sqlite3.Error:
+                            logger.exception("Autosave failed; retrying on the next flush")
+                            self._requeue(batches)
+        finally:
+            conn.close()
+
+    def flush(self):
+        """Write everything pending now, on the calling thread."""
+        with self._write_lock:
+            batches = self._take()
+            if batches:
+                self.store.save_items(batches)
+
+    def close(self):
+        self._stopped = True
+        self._wake.set()
+        self.flush()